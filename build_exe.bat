@@ -6,6 +6,9 @@ if exist build rmdir /s /q build
 echo Installing/Updating PyInstaller...
 call .\venv\Scripts\pip install pyinstaller
 
+echo Precompiling smoothing and gesture kernels (Numba AOT)...
+call .\venv\Scripts\python smoothing_aot.py
+
 echo Running PyInstaller...
 .\venv\Scripts\pyinstaller --noconsole --onefile --icon=ghost_hand.png ^
     --name=GhostHand ^
@@ -1,20 +1,134 @@
+import logging
 import math
+import sys
 import time
 from collections import deque
+from enum import IntEnum
 
-class GestureState:
-    SLEEP = "SLEEP"
-    IDLE = "IDLE"      # Hand detected, but not in tracking pose
-    TRACKING = "TRACKING" # Clutch engaged (Strictly One Finger Up)
-    CLICK_PENDING = "CLICK_PENDING"
-    SCROLLING = "SCROLLING"
+from numba_compat import njit
 
-class GestureAction:
-    NONE = "NONE"
-    CLICK = "CLICK"
-    WAKE = "WAKE"
-    SLEEP = "SLEEP"
-    SCROLL = "SCROLL"
+logger = logging.getLogger(__name__)
+
+# Ahead-of-time build of the kernels below (python smoothing_aot.py). Frozen builds
+# only: the eager signatures would otherwise compile on every launch (no disk cache
+# there), and from source a leftover build would shadow edits to the kernels.
+gesture_cc = None
+if getattr(sys, 'frozen', False):
+    try:
+        import gesture_cc
+    except ImportError:
+        pass
+
+def _kernel(signature):
+    # With the AOT build loaded, skip the eager compile; the exports replace the kernels below
+    if gesture_cc is not None:
+        return lambda func: func
+    return njit(signature, fastmath=True, cache=True)
+
+# Landmark indices for the four fingers (Index, Middle, Ring, Pinky)
+FINGER_TIP_IDS = (8, 12, 16, 20)
+FINGER_MCP_IDS = (5, 9, 13, 17)
+FINGER_PIP_IDS = (6, 10, 14, 18)
+
+# Palm sign per handedness: palm faces camera when cp_z * sign > 0.
+# 0.0 = Unknown (always treated as facing).
+PALM_SIGNS = {"Right": 1.0, "Left": -1.0}
+
+# Feature mask bits returned by _compute_pose_mask
+# Bits 0-3: Index/Middle/Ring/Pinky up (Tip above MCP)
+INDEX_UP_BIT = 1 << 0
+MIDDLE_UP_BIT = 1 << 1
+RING_UP_BIT = 1 << 2
+PINKY_UP_BIT = 1 << 3
+FINGERS_UP_MASK = INDEX_UP_BIT | MIDDLE_UP_BIT | RING_UP_BIT | PINKY_UP_BIT
+PALM_FACING_BIT = 1 << 4
+# Bits 5-8: Index/Middle/Ring/Pinky extended (Tip above PIP), used by Hold-to-Wake
+FINGERS_EXTENDED_SHIFT = 5
+FINGERS_EXTENDED_MASK = 0xF << FINGERS_EXTENDED_SHIFT
+
+# Poses as exact finger-up patterns
+TRACKING_POSE = INDEX_UP_BIT                  # Index UP, others DOWN
+SCROLL_POSE = INDEX_UP_BIT | MIDDLE_UP_BIT    # Index + Middle UP, Ring + Pinky DOWN
+
+@_kernel('i4(f4[:, ::1], f4)')
+def _compute_pose_mask(lm, palm_sign):
+    """
+    Pose kernel over the (21, 3) landmark snapshot.
+    Returns the finger-up / palm-facing bitmask. Needed in every state.
+    """
+    # Palm Check: winding order (Cross Product Z)
+    # Landmarks: 0=Wrist, 5=IndexMCP, 17=PinkyMCP
+    # Note: MP y increases downwards. x increases right.
+    v1_x = lm[5, 0] - lm[0, 0]
+    v1_y = lm[5, 1] - lm[0, 1]
+    v2_x = lm[17, 0] - lm[0, 0]
+    v2_y = lm[17, 1] - lm[0, 1]
+    cp_z = (v1_x * v2_y) - (v1_y * v2_x)
+    
+    # Logic for Mirrored Frame (Selfie view):
+    # Right Hand Palm: Thumb on Left, Pinky on Right. V1(-x,-y), V2(+x,-y). CP > 0.
+    # Left Hand Palm: Thumb on Right, Pinky on Left. V1(+x,-y), V2(-x,-y). CP < 0.
+    is_palm = (palm_sign == 0.0) | (cp_z * palm_sign > 0)
+    
+    # Finger States (Basic y-check: Tip above MCP), Index -> Pinky
+    # Packed branch-free into one bitmask
+    mask = 0
+    for k in range(4):
+        mask |= int(lm[FINGER_TIP_IDS[k], 1] < lm[FINGER_MCP_IDS[k], 1]) << k
+        mask |= int(lm[FINGER_TIP_IDS[k], 1] < lm[FINGER_PIP_IDS[k], 1]) << (FINGERS_EXTENDED_SHIFT + k)
+    mask |= int(is_palm) << 4
+    
+    return mask
+
+@_kernel('Tuple((f4, f4))(f4[:, ::1])')
+def _compute_click_distances(lm):
+    """
+    Click kernel. Only needed while awake.
+    Returns (scale_ref_sq, raw_dist_sq), squared so no sqrt is needed
+    for the click threshold test.
+    Scalar on purpose: for two landmark pairs a NumPy gather + einsum is
+    ~5x slower than plain indexing, even without Numba (which can't compile einsum).
+    """
+    # Scale reference (Wrist to Index MCP) represents hand size
+    sx = lm[0, 0] - lm[5, 0]
+    sy = lm[0, 1] - lm[5, 1]
+    scale_ref_sq = sx * sx + sy * sy
+    if scale_ref_sq < 1e-4: scale_ref_sq = 1e-4 # Prevent div/0 (0.01**2)
+    
+    # Thumb action distance (Thumb Tip to Index MCP)
+    tx = lm[4, 0] - lm[5, 0]
+    ty = lm[4, 1] - lm[5, 1]
+    raw_dist_sq = tx * tx + ty * ty
+    
+    return scale_ref_sq, raw_dist_sq
+
+@_kernel('Tuple((f4, f4, b1))(f4[:, ::1], f4)')
+def _click_kernel(lm, thresh_sq):
+    """
+    Click distances plus the closed test in one native call.
+    thresh_sq: squared click threshold (passed in, so a threshold change never recompiles).
+    """
+    scale_ref_sq, raw_dist_sq = _compute_click_distances(lm)
+    return scale_ref_sq, raw_dist_sq, raw_dist_sq < thresh_sq * scale_ref_sq
+
+if gesture_cc is not None:
+    _compute_pose_mask = gesture_cc.compute_pose_mask
+    _compute_click_distances = gesture_cc.compute_click_distances
+    _click_kernel = gesture_cc.click_kernel
+
+class GestureState(IntEnum):
+    SLEEP = 0
+    IDLE = 1           # Hand detected, but not in tracking pose
+    TRACKING = 2       # Clutch engaged (Strictly One Finger Up)
+    CLICK_PENDING = 3
+    SCROLLING = 4
+
+class GestureAction(IntEnum):
+    NONE = 0
+    CLICK = 1
+    WAKE = 2
+    SLEEP = 3
+    SCROLL = 4
 
 class GestureManager:
     """
@@ -23,6 +137,7 @@ class GestureManager:
     def __init__(self):
         # Thresholds (Normalized 0.0 - 1.0)
         self.CLICK_THRESHOLD = 0.14     # Thumb Separated = Open
+        self._click_thresh_sq = self.CLICK_THRESHOLD ** 2
         
         # Wave Settings
         self.WAVE_HISTORY_SIZE = 20     # Frames to track for wave
@@ -34,93 +149,95 @@ class GestureManager:
         self.HOLD_STABILITY_THRESH = 0.05 # Movement variance allowed
         self.hold_start_time = 0
         
+        self.debug = False # Log click diagnostics
+        
         self.current_state = GestureState.SLEEP # Start in SLEEP
         self.prev_state = GestureState.SLEEP
         
         # State tracking for click
         self.was_thumb_closed = False 
         
-        # Wave tracking
-        self.wrist_history = deque(maxlen=self.WAVE_HISTORY_SIZE)
+        # Wave tracking (Sliding window of wrist X positions)
+        # Monotonic deques of (frame_idx, x) give O(1) window min/max.
+        self._wrist_idx = 0
+        self._wrist_filled = 0
+        self._min_dq = deque()
+        self._max_dq = deque()
         self.last_toggle_time = 0
         
+        # Palm sign for the current handedness, only re-resolved when it changes
+        self._last_handedness = None
+        self._palm_sign = 0.0
+        
     def set_click_threshold(self, val):
         self.CLICK_THRESHOLD = val
+        self._click_thresh_sq = val ** 2
 
-    def _is_palm_facing(self, landmarks, handedness):
+    def _push_wrist(self, x):
         """
-        Determines if the palm is facing the camera using winding order (Cross Product Z).
-        Assumption: Frame is mirrored (Selfie view).
+        Appends a wrist X position to the sliding window (amortized O(1)).
+        Front of _min_dq / _max_dq is always the window min / max.
         """
-        if not handedness:
-            return True # Fallback if unknown
+        n = self.WAVE_HISTORY_SIZE
+        idx = self._wrist_idx
+        x = float(x)
+        
+        min_dq = self._min_dq
+        while min_dq and min_dq[-1][1] >= x:
+            min_dq.pop()
+        min_dq.append((idx, x))
+        if min_dq[0][0] <= idx - n:
+            min_dq.popleft()
             
-        # Landmarks: 0=Wrist, 5=IndexMCP, 17=PinkyMCP
-        p0 = landmarks.landmark[0]
-        p5 = landmarks.landmark[5]
-        p17 = landmarks.landmark[17]
-        
-        # Vectors 0->5 and 0->17
-        # Note: MP y increases downwards. x increases right.
-        v1_x = p5.x - p0.x
-        v1_y = p5.y - p0.y
-        
-        v2_x = p17.x - p0.x
-        v2_y = p17.y - p0.y
-        
-        # Cross Product Z component (2D determinant)
-        # cp_z = (v1_x * v2_y) - (v1_y * v2_x)
-        cp_z = (v1_x * v2_y) - (v1_y * v2_x)
-        
-        # Logic for Mirrored Frame:
-        # Right Hand Palm: Thumb on Left, Pinky on Right. V1(-x,-y), V2(+x,-y). CP > 0.
-        # Left Hand Palm: Thumb on Right, Pinky on Left. V1(+x,-y), V2(-x,-y). CP < 0.
-        
-        if handedness == "Right":
-            return cp_z > 0
-        elif handedness == "Left":
-            return cp_z < 0
-        
-        return True
-        
-    def _detect_hold_to_wake(self, landmarks):
+        max_dq = self._max_dq
+        while max_dq and max_dq[-1][1] <= x:
+            max_dq.pop()
+        max_dq.append((idx, x))
+        if max_dq[0][0] <= idx - n:
+            max_dq.popleft()
+            
+        self._wrist_idx = idx + 1
+        self._wrist_filled = min(self._wrist_filled + 1, n)
+
+    def _clear_wrist_history(self):
+        self._wrist_filled = 0
+        self._min_dq.clear()
+        self._max_dq.clear()
+
+    def _detect_hold_to_wake(self, mask, now):
         """
         Detects if user is holding open palm steadily.
+        mask: pose bitmask of the current frame (from process).
+        now: timestamp of the current frame (from process).
         """
         # 1. Check Open Palm (5 fingers)
-        tips_ids = [4, 8, 12, 16, 20]
-        pips_ids = [2, 6, 10, 14, 18] # thumb uses IP (3) vs MCP(2). MediaPipe: 4=Tip, 3=IP, 2=MCP. 
+        # Thumb uses IP (3) vs MCP(2). MediaPipe: 4=Tip, 3=IP, 2=MCP.
         # For thumb, check tip vs MCP logic? Or just check if it's far from index?
         # Simple heuristic: x dist of thumb tip from index mcp?
         # Let's use the standard "fingers extended" logic for 4 fingers + thumb check.
         
-        fingers_open = 0
-        # Index to Pinky
-        for i in range(1, 5):
-            if landmarks.landmark[tips_ids[i]].y < landmarks.landmark[pips_ids[i]].y:
-                fingers_open += 1
-        
+        # Index to Pinky: Tip above PIP (bits computed by the pose kernel)
         # Thumb: Tip further from index MCP than IP? Or just use general shape.
         # Let's assume 4 fingers open is 'Open Palm' enough for wake.
-        if fingers_open < 4:
+        if (mask & FINGERS_EXTENDED_MASK) != FINGERS_EXTENDED_MASK:
             self.hold_start_time = 0
             return False
 
         # 2. Check Stability (Wrist History)
-        # We need history. process() appends to wrist_history.
-        if len(self.wrist_history) < self.WAVE_HISTORY_SIZE:
+        # We need history. process() appends to the wrist ring buffer.
+        if self._wrist_filled < self.WAVE_HISTORY_SIZE:
              return False
              
-        x_min = min(self.wrist_history)
-        x_max = max(self.wrist_history)
+        x_min = self._min_dq[0][1]
+        x_max = self._max_dq[0][1]
         diff = x_max - x_min
         
         if diff < self.HOLD_STABILITY_THRESH:
             # Stable
             if self.hold_start_time == 0:
-                self.hold_start_time = time.time()
+                self.hold_start_time = now
                 # print("Hold Started...")
-            elif (time.time() - self.hold_start_time) > self.HOLD_TIME_REQUIRED:
+            elif (now - self.hold_start_time) > self.HOLD_TIME_REQUIRED:
                 self.hold_start_time = 0 # Reset
                 return True
         else:
@@ -133,14 +250,14 @@ class GestureManager:
         """
         Detects if user is waving (Open Palm, moving side to side).
         """
-        if len(self.wrist_history) < self.WAVE_HISTORY_SIZE:
+        if self._wrist_filled < self.WAVE_HISTORY_SIZE:
             return False
             
         # 1. (Open Palm check moved to caller)
             
         # 2. Check X Movement Variance
-        x_min = min(self.wrist_history)
-        x_max = max(self.wrist_history)
+        x_min = self._min_dq[0][1]
+        x_max = self._max_dq[0][1]
         
         # EDGE REJECTION:
         # Ignore if the movement touches the edges (Swipe Across)
@@ -155,66 +272,55 @@ class GestureManager:
              
         return False
 
-    def process(self, landmarks, handedness=None):
+    def process(self, lm, handedness=None):
         """
+        lm: (21, 3) float32 C-contiguous landmark array (SoA), or None if no hand.
         Returns (state, action)
         """
         current_time = time.time()
         
-        if not landmarks:
+        if lm is None:
             self.hold_start_time = 0 # Lost hand, reset hold
             return self.current_state, GestureAction.NONE
             
-        # Calc basic features
-        thumb_tip = landmarks.landmark[4]
-        index_tip = landmarks.landmark[8]
-        middle_tip = landmarks.landmark[12]
-        ring_tip = landmarks.landmark[16]
-        pinky_tip = landmarks.landmark[20]
-        
-        wrist = landmarks.landmark[0]
-        
-        # Finger States (Basic y-check vs PIP/MCP for simplicity)
-        index_mcp = landmarks.landmark[5]
-        middle_mcp = landmarks.landmark[9]
-        ring_mcp = landmarks.landmark[13]
-        pinky_mcp = landmarks.landmark[17]
-        
-        is_index_up = index_tip.y < index_mcp.y
-        is_middle_up = middle_tip.y < middle_mcp.y
-        is_ring_up = ring_tip.y < ring_mcp.y
-        is_pinky_up = pinky_tip.y < pinky_mcp.y
-        
-        # Fingers Open Count (for generic "Hand Open")
-        fingers_open = 0
-        if is_index_up: fingers_open += 1
-        if is_middle_up: fingers_open += 1
-        if is_ring_up: fingers_open += 1
-        if is_pinky_up: fingers_open += 1
+        wrist_x = float(lm[0, 0])
+            
+        # Calc pose features (single native call)
+        if handedness != self._last_handedness:
+            self._last_handedness = handedness
+            self._palm_sign = PALM_SIGNS.get(handedness, 0.0)
+            
+        mask = _compute_pose_mask(lm, self._palm_sign)
+        fingers_mask = mask & FINGERS_UP_MASK
         
         # Palm Check
-        is_palm = self._is_palm_facing(landmarks, handedness)
+        is_palm = bool(mask & PALM_FACING_BIT)
 
         # --- GLOBAL WAKE/SLEEP CHECK ---
         
         # A. Hold to Wake (Only if Sleeping)
         if self.current_state == GestureState.SLEEP:
              # Important: We must update history for stability check
-             self.wrist_history.append(landmarks.landmark[0].x)
+             self._push_wrist(wrist_x)
              
              # Require Palm Facing for Hold-to-Wake
-             if is_palm and self._detect_hold_to_wake(landmarks):
+             if is_palm and self._detect_hold_to_wake(mask, current_time):
                  self.last_toggle_time = current_time
                  self.current_state = GestureState.IDLE
-                 self.wrist_history.clear()
+                 self._clear_wrist_history()
                  return self.current_state, GestureAction.WAKE
         
         # B. Wave Detection (Wake OR Sleep)
-        self.wrist_history.append(landmarks.landmark[0].x)
-        if (current_time - self.last_toggle_time > self.WAVE_COOLDOWN):
+        self._push_wrist(wrist_x)
+        # Only eligible once the cooldown has elapsed and the window is full;
+        # otherwise skip the hand-open aggregation entirely.
+        wave_eligible = (current_time - self.last_toggle_time > self.WAVE_COOLDOWN) and \
+                        self._wrist_filled == self.WAVE_HISTORY_SIZE
+        if wave_eligible:
             # Require 3+ fingers to count as a "Hand Open" Wave
             # AND Require Palm Facing to prevent Back-of-hand swipes
-            if fingers_open >= 3 and is_palm:
+            # Fingers Open Count (for generic "Hand Open") = popcount
+            if is_palm and bin(fingers_mask).count("1") >= 3:
                 if self._detect_wave():
                     self.last_toggle_time = current_time
                     
@@ -231,37 +337,19 @@ class GestureManager:
 
         # --- NORMAL OPERATION ---
         
-        # Extract key points
-        thumb_tip = landmarks.landmark[4]
-        index_mcp = landmarks.landmark[5]   # Base of index finger
-        
-        index_pip = landmarks.landmark[6]
-        
-        middle_pip = landmarks.landmark[10]
-        ring_pip = landmarks.landmark[14]
-        pinky_pip = landmarks.landmark[18]
-        
         # 1. Track ONLY if Index is UP and others are DOWN
-        is_tracking_pose = is_index_up and (not is_middle_up) and (not is_ring_up) and (not is_pinky_up)
+        is_tracking_pose = fingers_mask == TRACKING_POSE
         
         # 2. Scroll Pose: Index + Middle UP. Ring + Pinky DOWN.
         # Thumb: Relaxed. No strict check prevents hand strain.
         # This allows both "Three Finger Gun" and "Peace Sign" to scroll.
         
-        # Calculate scale reference (Wrist to Index MCP) represents hand size
-        scale_ref = math.sqrt((wrist.x - index_mcp.x)**2 + (wrist.y - index_mcp.y)**2)
-        if scale_ref < 0.01: scale_ref = 0.01 # Prevent div/0
-
-        # Calculate thumb action distance (Thumb Tip to Index MCP)
-        raw_dist = math.sqrt((thumb_tip.x - index_mcp.x)**2 + (thumb_tip.y - index_mcp.y)**2)
-        
-        # Normalized Ratio (Scale Invariant)
-        click_ratio = raw_dist / scale_ref
-        
-        is_thumb_closed = click_ratio < self.CLICK_THRESHOLD
+        # Normalized Ratio (Scale Invariant), compared squared:
+        # raw_dist / scale_ref < T  <=>  raw_dist^2 < T^2 * scale_ref^2
+        scale_ref_sq, raw_dist_sq, is_thumb_closed = _click_kernel(lm, self._click_thresh_sq)
         is_thumb_open = not is_thumb_closed
         
-        is_scroll_pose = is_index_up and is_middle_up and (not is_ring_up) and (not is_pinky_up)
+        is_scroll_pose = fingers_mask == SCROLL_POSE
         
         # State Machine
         action = GestureAction.NONE
@@ -272,7 +360,9 @@ class GestureManager:
             
             # Click Trigger
             if self.was_thumb_closed and is_thumb_open:
-                 print(f"CLICK TRIGGERED! Ratio: {click_ratio:.3f} (Thresh: {self.CLICK_THRESHOLD})")
+                 if self.debug:
+                     click_ratio = math.sqrt(raw_dist_sq / scale_ref_sq)
+                     logger.debug("CLICK TRIGGERED! Ratio: %.3f (Thresh: %s)", click_ratio, self.CLICK_THRESHOLD)
                  action = GestureAction.CLICK
                  new_state = GestureState.CLICK_PENDING 
                  
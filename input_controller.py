@@ -1,6 +1,14 @@
 import ctypes
-import win32api
-import win32con
+import queue
+import threading
+
+# Win32 constants (winuser.h)
+MOUSEEVENTF_MOVE = 0x0001
+MOUSEEVENTF_LEFTDOWN = 0x0002
+MOUSEEVENTF_LEFTUP = 0x0004
+MOUSEEVENTF_WHEEL = 0x0800
+SM_CXSCREEN = 0
+SM_CYSCREEN = 1
 
 # Structures for SendInput
 class POINT(ctypes.Structure):
@@ -20,13 +28,88 @@ class INPUT(ctypes.Structure):
     _fields_ = [("type", ctypes.c_ulong),
                 ("ki", _INPUT)]
 
+# Two INPUTs submitted in a single SendInput call (e.g. Down + Up)
+INPUT_ARRAY2 = INPUT * 2
+
+# Event types for the input worker queue
+EVT_MOVE = 0
+EVT_CLICK = 1
+EVT_SCROLL = 2
+
 class InputController:
     """
-    Interfaces with Windows user32.dll / pywin32 to control the mouse.
+    Interfaces with Windows user32.dll to control the mouse.
+    Public methods only enqueue events; a daemon thread issues the SendInput
+    syscalls so the vision thread never blocks on them.
     """
     def __init__(self):
-        self.screen_width = win32api.GetSystemMetrics(win32con.SM_CXSCREEN)
-        self.screen_height = win32api.GetSystemMetrics(win32con.SM_CYSCREEN)
+        user32 = ctypes.windll.user32
+        self.screen_width = user32.GetSystemMetrics(SM_CXSCREEN)
+        self.screen_height = user32.GetSystemMetrics(SM_CYSCREEN)
+        
+        # Bind SendInput once with explicit types so ctypes skips per-call inference
+        self._SendInput = user32.SendInput
+        self._SendInput.argtypes = [ctypes.c_uint, ctypes.c_void_p, ctypes.c_int]
+        self._SendInput.restype = ctypes.c_uint
+        self._input_size = ctypes.sizeof(INPUT)
+        
+        # Reusable single INPUT (refilled per call instead of allocated)
+        self._single_input = INPUT()
+        self._single_input.type = 0 # INPUT_MOUSE
+        self._single_input_ref = ctypes.byref(self._single_input)
+        
+        # Dedicated move INPUT: constant fields set once, only dx/dy change per frame
+        self._move_inp = INPUT()
+        self._move_inp.type = 0 # INPUT_MOUSE
+        self._move_inp.ki.mi.dwFlags = MOUSEEVENTF_MOVE
+        self._move_inp.ki.mi.time = 0
+        self._move_inp.ki.mi.mouseData = 0
+        self._move_ref = ctypes.byref(self._move_inp)
+        
+        # Sub-pixel motion carried over between calls
+        self._acc_x = 0.0
+        self._acc_y = 0.0
+        
+        # Input worker (single producer / single consumer)
+        self._queue = queue.SimpleQueue()
+        self._worker = threading.Thread(target=self._input_loop, name="InputWorker", daemon=True)
+        self._worker.start()
+
+    def _input_loop(self):
+        """
+        Drains the event queue and sends everything pending as one batch.
+        """
+        q = self._queue
+        while True:
+            evts = [q.get()]
+            while True:
+                try:
+                    evts.append(q.get_nowait())
+                except queue.Empty:
+                    break
+            self._send_batch(evts)
+
+    def _send_batch(self, evts):
+        # Coalesce consecutive MOVE events by summing deltas.
+        # Click/Scroll flush the pending motion first to keep event order.
+        acc_x = acc_y = 0
+        for kind, a, b in evts:
+            if kind == EVT_MOVE:
+                acc_x += a
+                acc_y += b
+                continue
+                
+            if acc_x or acc_y:
+                self._send_move(acc_x, acc_y)
+                acc_x = acc_y = 0
+                
+            if kind == EVT_CLICK:
+                self._send_click()
+            elif kind == EVT_SCROLL:
+                self._send_scroll(a)
+                
+        if acc_x or acc_y:
+            self._send_move(acc_x, acc_y)
 
     def move_cursor_relative(self, dx, dy, sensitivity=2.0):
         """
@@ -34,41 +117,46 @@ class InputController:
         dx, dy: normalized deltas (-1.0 to 1.0) or raw pixel deltas.
         sensitivity: multiplier for the movement.
         """
-        # Calculate pixel delta
-        pixel_dx = int(dx * sensitivity)
-        pixel_dy = int(dy * sensitivity)
+        # Calculate pixel delta, keeping the fractional remainder so small
+        # motions accrue instead of being truncated to zero every frame
+        self._acc_x += dx * sensitivity
+        self._acc_y += dy * sensitivity
+        pixel_dx = int(self._acc_x)
+        pixel_dy = int(self._acc_y)
+        self._acc_x -= pixel_dx
+        self._acc_y -= pixel_dy
         
         if pixel_dx == 0 and pixel_dy == 0:
             return
 
+        self._queue.put((EVT_MOVE, pixel_dx, pixel_dy))
+
+    def _send_move(self, pixel_dx, pixel_dy):
         # Use SendInput for relative movement
         # MOUSEEVENTF_MOVE (0x0001) moves relative to current position
         # unless MOUSEEVENTF_ABSOLUTE is set.
+        # Coalesced swipes stay relative too: that works across monitors and keeps
+        # pointer acceleration consistent regardless of swipe size.
+        mi = self._move_inp.ki.mi
+        mi.dx = pixel_dx
+        mi.dy = pixel_dy
         
-        flags = win32con.MOUSEEVENTF_MOVE
-        
-        inp = INPUT()
-        inp.type = 0 # INPUT_MOUSE
-        inp.ki.mi.dx = pixel_dx
-        inp.ki.mi.dy = pixel_dy
-        inp.ki.mi.dwFlags = flags
-        inp.ki.mi.time = 0
-        inp.ki.mi.mouseData = 0
-        
-        ctypes.windll.user32.SendInput(1, ctypes.byref(inp), ctypes.sizeof(inp))
+        self._SendInput(1, self._move_ref, self._input_size)
 
     def left_click(self):
         """
         Performs a full left click (down + up).
         """
-        self._send_mouse_event(win32con.MOUSEEVENTF_LEFTDOWN)
-        self._send_mouse_event(win32con.MOUSEEVENTF_LEFTUP)
-
-    def _send_mouse_event(self, flags):
-        inp = INPUT()
-        inp.type = 0 # INPUT_MOUSE
-        inp.ki.mi.dwFlags = flags
-        ctypes.windll.user32.SendInput(1, ctypes.byref(inp), ctypes.sizeof(inp))
+        self._queue.put((EVT_CLICK, 0, 0))
+
+    def _send_click(self):
+        # Submit Down + Up in one syscall
+        arr = INPUT_ARRAY2()
+        arr[0].type = 0 # INPUT_MOUSE
+        arr[0].ki.mi.dwFlags = MOUSEEVENTF_LEFTDOWN
+        arr[1].type = 0 # INPUT_MOUSE
+        arr[1].ki.mi.dwFlags = MOUSEEVENTF_LEFTUP
+        self._SendInput(2, ctypes.byref(arr), self._input_size)
         
     def scroll_vertical(self, steps):
         """
@@ -78,17 +166,18 @@ class InputController:
         """
         # WHEEL_DELTA is 120
         amount = int(steps * 120)
+        self._queue.put((EVT_SCROLL, amount, 0))
+
+    def _send_scroll(self, amount):
+        mi = self._single_input.ki.mi
+        mi.dx = 0
+        mi.dy = 0
+        mi.dwFlags = MOUSEEVENTF_WHEEL
+        mi.time = 0
+        mi.mouseData = amount
+        mi.dwExtraInfo = None
         
-        inp = INPUT()
-        inp.type = 0 # INPUT_MOUSE
-        inp.ki.mi.dx = 0
-        inp.ki.mi.dy = 0
-        inp.ki.mi.dwFlags = win32con.MOUSEEVENTF_WHEEL
-        inp.ki.mi.time = 0
-        inp.ki.mi.mouseData = amount
-        inp.ki.mi.dwExtraInfo = None
-        
-        ctypes.windll.user32.SendInput(1, ctypes.byref(inp), ctypes.sizeof(inp))
+        self._SendInput(1, self._single_input_ref, self._input_size)
 
 if __name__ == "__main__":
     import time
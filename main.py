@@ -1,48 +1,85 @@
 import sys
 import os
-import traceback
+import atexit
+import copy
 import ctypes # For Single Instance Lock (moved up)
+import functools
+import hashlib
 import json
+import logging
+import logging.handlers
+import queue
+import threading
 import time
+
+# Thread budget for OpenCV / MediaPipe (OpenMP): half the cores, so HD mode
+# can't oversubscribe the machine and starve the Qt thread that draws the overlay.
+# Tradeoff: slightly lower peak inference throughput on big CPUs.
+# OMP_NUM_THREADS is only read when the native libs load, so set it before importing them.
+CPU_THREAD_BUDGET = max(1, (os.cpu_count() or 2) // 2)
+os.environ.setdefault("OMP_NUM_THREADS", str(CPU_THREAD_BUDGET))
+
 import cv2
-import numpy as np
 import mediapipe as mp
 
 # Setup Logging for Debugging Standalone Crashes
-# This redirects all print() and error output to ghost_hand.log
+# All modules log to ghost_hand.log. Records go through a queue and a background
+# listener thread does the file I/O, so the vision loop never waits on the disk.
 log_path = os.path.join(os.path.dirname(sys.executable) if getattr(sys, 'frozen', False) else os.path.dirname(os.path.abspath(__file__)), "ghost_hand.log")
-sys.stdout = open(log_path, "a", buffering=1)
-sys.stderr = sys.stdout
-print(f"--- GhostHand Starting ---")
+_log_file_handler = logging.handlers.RotatingFileHandler(log_path, maxBytes=1_000_000, backupCount=2, encoding="utf-8")
+_log_file_handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s [%(threadName)s] %(name)s: %(message)s"))
+_log_queue = queue.Queue()
+_log_listener = logging.handlers.QueueListener(_log_queue, _log_file_handler)
+_log_listener.start()
+atexit.register(_log_listener.stop) # Flushes whatever is still queued
+
+# Release builds only keep warnings and errors
+logging.basicConfig(
+    handlers=[logging.handlers.QueueHandler(_log_queue)],
+    level=logging.WARNING if getattr(sys, 'frozen', False) else logging.INFO
+)
+logger = logging.getLogger("GhostHand")
+logger.info("--- GhostHand Starting ---")
 
 def exception_hook(exctype, value, tb):
-    print("Uncaught exception:")
-    traceback.print_exception(exctype, value, tb)
+    logger.critical("Uncaught exception:", exc_info=(exctype, value, tb))
     sys.exit(1)
 
 sys.excepthook = exception_hook
 
+# Worker threads (InputWorker, CameraReader, ...) would otherwise print to
+# stderr, which is None in --noconsole builds
+def thread_exception_hook(args):
+    if args.exc_type is SystemExit:
+        return
+    name = args.thread.name if args.thread else "?"
+    logger.critical("Uncaught exception in thread %s:", name,
+                    exc_info=(args.exc_type, args.exc_value, args.exc_traceback))
+
+threading.excepthook = thread_exception_hook
+
+# warnings.warn -> "py.warnings" logger -> ghost_hand.log
+logging.captureWarnings(True)
+
 from PyQt6.QtWidgets import (QApplication, QSystemTrayIcon, QMenu, QDialog, 
                              QVBoxLayout, QHBoxLayout, QSlider, QLabel, QPushButton, 
                              QWidget, QStyle, QCheckBox, QMessageBox, QComboBox, QInputDialog)
-from PyQt6.QtCore import QThread, pyqtSignal, QObject, Qt, QTimer
-from PyQt6.QtGui import QIcon, QAction, QPixmap
+from PyQt6.QtCore import QThread, pyqtSignal, QObject, Qt, QTimer, QSize
+from PyQt6.QtGui import QIcon, QAction, QPixmap, QPainter, QPen, QColor
 
-from vision_core import VisionEngine
+from vision_core import VisionEngine, HAND_MODEL_FILE, put_latest
 from input_controller import InputController
 from gesture_engine import GestureManager, GestureState, GestureAction
-from overlay_ui import OverlayWindow
-from smoothing import OneEuroFilter
+from overlay_ui import OverlayWindow, OVERLAY_TRACKING, OVERLAY_SLEEP, OVERLAY_SCROLLING
+from smoothing import new_one_euro_state, cursor_step
+
+# PyInstaller creates a temp folder and stores path in _MEIPASS
+_BASE_PATH = getattr(sys, "_MEIPASS", os.path.abspath("."))
 
+@functools.lru_cache(maxsize=16)
 def resource_path(relative_path):
     """ Get absolute path to resource, works for dev and for PyInstaller """
-    try:
-        # PyInstaller creates a temp folder and stores path in _MEIPASS
-        base_path = sys._MEIPASS
-    except Exception:
-        base_path = os.path.abspath(".")
-
-    return os.path.join(base_path, relative_path)
+    return os.path.join(_BASE_PATH, relative_path)
 
 # Ensure config is stored in the same directory as the executable (not temp dir)
 if getattr(sys, 'frozen', False):
@@ -51,6 +88,8 @@ else:
     application_path = os.path.dirname(os.path.abspath(__file__))
 
 CONFIG_FILE = os.path.join(application_path, "config.json")
+# Optional Tasks API model: dropped next to the exe / main.py by the user (not bundled)
+HAND_MODEL_PATH = os.path.join(application_path, HAND_MODEL_FILE)
 
 DEFAULT_PROFILE = {
     "sensitivity_x": 1500.0,
@@ -68,37 +107,58 @@ DEFAULT_ROOT_CONFIG = {
     }
 }
 
+# Hash of the config JSON currently on disk (last read or written),
+# so saving an unchanged config doesn't touch the disk
+_last_saved_hash = None
+
+def _config_digest(text):
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest()
+
+def _default_config():
+    # Deep copy: the nested profile dicts must not alias DEFAULT_ROOT_CONFIG
+    return copy.deepcopy(DEFAULT_ROOT_CONFIG)
+
 def load_config():
+    """
+    Loads config.json (migrating legacy flat configs) and always returns a
+    sanitized config: every profile has every DEFAULT_PROFILE key.
+    """
+    global _last_saved_hash
     if not os.path.exists(CONFIG_FILE):
-        return DEFAULT_ROOT_CONFIG.copy()
+        return _default_config()
     
     try:
         with open(CONFIG_FILE, 'r') as f:
-            data = json.load(f)
-            
-            # Migration Logic: Check if it's a legacy flat config
-            if "profiles" not in data:
-                print("Migrating legacy config to profiles...")
-                new_config = DEFAULT_ROOT_CONFIG.copy()
-                # Copy known keys to Default profile
-                for key in DEFAULT_PROFILE:
-                    if key in data:
-                        new_config["profiles"]["Default"][key] = data[key]
-                
-                return new_config
-            
-                return new_config
+            text = f.read()
+            data = json.loads(text)
+            # A file we wrote ourselves re-serializes to the same bytes, so the
+            # startup save is skipped unless migration/sanitizing changed something
+            _last_saved_hash = _config_digest(text)
             
-            data = sanitize_config(data)
-            return data
+        # Migration Logic: Check if it's a legacy flat config
+        if "profiles" not in data:
+            logger.info("Migrating legacy config to profiles...")
+            new_config = _default_config()
+            # Copy known keys to Default profile
+            for key in DEFAULT_PROFILE:
+                if key in data:
+                    new_config["profiles"]["Default"][key] = data[key]
+            data = new_config
+        
+        # Migrated configs get sanitized too
+        return sanitize_config(data)
     except Exception as e:
-        print(f"Error loading config: {e}")
-        return DEFAULT_ROOT_CONFIG.copy()
+        logger.error("Error loading config: %s", e)
+        return _default_config()
 
 def sanitize_config(config):
     # Ensure all profiles have valid values
     if "profiles" not in config:
-        config["profiles"] = DEFAULT_ROOT_CONFIG["profiles"].copy()
+        config["profiles"] = _default_config()["profiles"]
+    if "Default" not in config["profiles"]:
+        config["profiles"]["Default"] = DEFAULT_PROFILE.copy()
+    if config.get("current_profile") not in config["profiles"]:
+        config["current_profile"] = "Default"
         
     for name, p in config["profiles"].items():
         # Enforce Minimums/Defaults
@@ -115,20 +175,24 @@ def sanitize_config(config):
     return config
 
 def save_config(config):
+    global _last_saved_hash
     try:
+        data = json.dumps(config, indent=4)
+        digest = _config_digest(data)
+        if digest == _last_saved_hash:
+            return
+        
         with open(CONFIG_FILE, 'w') as f:
-            json.dump(config, f, indent=4)
-        print("Config saved.")
+            f.write(data)
+        _last_saved_hash = digest
+        logger.info("Config saved.")
     except Exception as e:
-        print(f"Error saving config: {e}")
+        logger.error("Error saving config: %s", e)
 
 class SettingsDialog(QDialog):
     # Signals to worker
-    sensitivity_changed = pyqtSignal(float, float) 
-    keep_awake_toggled = pyqtSignal(bool)
-    high_perf_toggled = pyqtSignal(bool)
-    click_threshold_changed = pyqtSignal(float)
-    invert_scroll_toggled = pyqtSignal(bool)
+    # One dict per update: {'sx', 'sy', 'ct', 'ka', 'hp', 'inv'}
+    settings_updated = pyqtSignal(object)
     wake_requested = pyqtSignal()
     
     # Signal to App to save config
@@ -140,6 +204,9 @@ class SettingsDialog(QDialog):
         self.setFixedSize(320, 520)
         self.config = config_ref
         
+        # Throttle: coalesce rapid slider ticks into one emit per ~16 ms
+        self._emit_pending = False
+        
         layout = QVBoxLayout()
         
         # --- PROFILE HEADER ---
@@ -248,18 +315,18 @@ class SettingsDialog(QDialog):
         
         self.blockSignals(True)
         
-        sx = int(p.get("sensitivity_x", 1500))
-        sy = int(p.get("sensitivity_y", 1500))
-        ct = int(p.get("click_threshold", 0.20) * 1000)
+        sx = int(p["sensitivity_x"])
+        sy = int(p["sensitivity_y"])
+        ct = int(p["click_threshold"] * 1000)
         
-        print(f"DEBUG: Loading Profile '{name}' -> SX:{sx} SY:{sy} CT:{ct}")
+        logger.debug("Loading Profile '%s' -> SX:%s SY:%s CT:%s", name, sx, sy, ct)
         
         self.slider_x.setValue(sx)
         self.slider_y.setValue(sy)
         self.slider_click.setValue(ct)
-        self.chk_keep_awake.setChecked(p.get("keep_awake", False))
-        self.chk_high_perf.setChecked(p.get("high_performance", False))
-        self.chk_invert_scroll.setChecked(p.get("invert_scroll", False))
+        self.chk_keep_awake.setChecked(p["keep_awake"])
+        self.chk_high_perf.setChecked(p["high_performance"])
+        self.chk_invert_scroll.setChecked(p["invert_scroll"])
         
         # Update Labels
         self.label_x.setText(str(self.slider_x.value()))
@@ -327,238 +394,412 @@ class SettingsDialog(QDialog):
         self.emit_all_updates()
 
     def emit_all_updates(self):
-        val_x = self.slider_x.value()
-        val_y = self.slider_y.value()
-        val_click = self.slider_click.value() / 1000.0
+        if self._emit_pending:
+            return
+        self._emit_pending = True
+        QTimer.singleShot(16, self._flush_updates)
+
+    def _flush_updates(self):
+        # Read the UI at flush time so the latest values win
+        self._emit_pending = False
+        self.settings_updated.emit({
+            'sx': float(self.slider_x.value()),
+            'sy': float(self.slider_y.value()),
+            'ct': self.slider_click.value() / 1000.0,
+            'ka': self.chk_keep_awake.isChecked(),
+            'hp': self.chk_high_perf.isChecked(),
+            'inv': self.chk_invert_scroll.isChecked(),
+        })
+
+
+# Cursor loop runs faster than inference; in-between ticks are extrapolated
+CURSOR_HZ = 120.0
+CURSOR_PERIOD = 1.0 / CURSOR_HZ
+MAX_EXTRAPOLATION = 0.1 # s, stop predicting if inference stalls longer than this
+
+class DebugWindow(QLabel):
+    """
+    Silhouette debug view. Painted with QPainter from the landmark packets
+    the worker sends, so the vision thread never touches a GUI window.
+    """
+    closed = pyqtSignal()
+    quit_requested = pyqtSignal()
+    
+    STATE_COLORS = {
+        GestureState.IDLE: QColor(255, 255, 255),
+        GestureState.TRACKING: QColor(0, 255, 0),
+        GestureState.SCROLLING: QColor(0, 255, 255),
+        GestureState.CLICK_PENDING: QColor(255, 0, 0),
+        GestureState.SLEEP: QColor(150, 50, 50),
+    }
+    
+    def __init__(self):
+        super().__init__()
+        self.setWindowTitle("Ghost Hand Debug (Silhouette)")
+        self.connections = mp.solutions.hands.HAND_CONNECTIONS
+        self.canvas = None # Reused while the frame size stays the same
         
-        self.sensitivity_changed.emit(float(val_x), float(val_y))
-        self.click_threshold_changed.emit(val_click)
-        self.keep_awake_toggled.emit(self.chk_keep_awake.isChecked())
-        self.high_perf_toggled.emit(self.chk_high_perf.isChecked())
-        self.invert_scroll_toggled.emit(self.chk_invert_scroll.isChecked())
-
+        self.hand_pen = QPen(QColor(0, 255, 0), 2)
+        self.text_color = QColor(200, 200, 200)
+        self.idle_color = QColor(100, 100, 100)
+        
+    def show_debug(self, packet):
+        if not self.isVisible():
+            return
+        w, h, lm, state, handedness, cursor_norm = packet
+        
+        if self.canvas is None or self.canvas.size() != QSize(w, h):
+            self.canvas = QPixmap(w, h)
+        self.canvas.fill(Qt.GlobalColor.black)
+        
+        painter = QPainter(self.canvas)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        font = painter.font()
+        font.setPointSize(12)
+        painter.setFont(font)
+        
+        if lm is not None:
+            pts = [(float(x) * w, float(y) * h) for x, y, _ in lm]
+            painter.setPen(self.hand_pen)
+            painter.setBrush(QColor(0, 255, 0))
+            for a, b in self.connections:
+                painter.drawLine(int(pts[a][0]), int(pts[a][1]), int(pts[b][0]), int(pts[b][1]))
+            for x, y in pts:
+                painter.drawEllipse(int(x) - 2, int(y) - 2, 4, 4)
+            
+            status_color = self.STATE_COLORS.get(state, self.idle_color)
+            cx, cy = int(cursor_norm[0] * w), int(cursor_norm[1] * h)
+            painter.setPen(Qt.PenStyle.NoPen)
+            painter.setBrush(status_color)
+            painter.drawEllipse(cx - 8, cy - 8, 16, 16)
+            
+            painter.setPen(status_color)
+            painter.drawText(10, 30, f"State: {state.name}")
+            if handedness:
+                painter.setPen(self.text_color)
+                painter.drawText(10, 60, f"Hand: {handedness}")
+        else:
+            painter.setPen(self.idle_color)
+            painter.drawText(30, h // 2, "No Hand Detected")
+        
+        painter.end()
+        self.setPixmap(self.canvas)
+        
+    def keyPressEvent(self, event):
+        if event.key() == Qt.Key.Key_Q:
+            self.quit_requested.emit()
+        else:
+            super().keyPressEvent(event)
+            
+    def closeEvent(self, event):
+        self.closed.emit()
+        super().closeEvent(event)
+        
+    def hideEvent(self, event):
+        # Teardown runs once per toggle-off (tray or window close), on the GUI thread
+        self.clear()
+        self.canvas = None
+        super().hideEvent(event)
+
+class _Settings(ctypes.Structure):
+    """
+    Worker settings written by the GUI thread. The worker copies the whole
+    struct once per frame (one memmove under the lock) and reads the copy.
+    """
+    _fields_ = [
+        ("sx", ctypes.c_float),     # Sensitivity X
+        ("sy", ctypes.c_float),     # Sensitivity Y
+        ("flags", ctypes.c_uint32), # SETTING_* bits
+    ]
+
+# _Settings.flags bits
+SETTING_KEEP_AWAKE = 1 << 0
+SETTING_INVERT_SCROLL = 1 << 1
+SETTING_HIGH_PERF = 1 << 2   # Last requested mode (the switch itself is a command)
+
+# Worker commands: rare one-shot events, pushed as (CMD_*, value) tuples
+CMD_WAKE = 0
+CMD_CLICK_THRESH = 1
+CMD_PERF = 2
 
 class VisionWorker(QThread):
     # Signals
-    update_overlay_signal = pyqtSignal(int, int, bool, bool, bool) # x, y, is_tracking, is_sleep, is_scrolling
+    update_overlay_signal = pyqtSignal(int, int, int) # x, y, OVERLAY_* flags
+    debug_frame_signal = pyqtSignal(object) # (w, h, landmarks (21, 3) or None, state, handedness, cursor_norm)
     finished_signal = pyqtSignal()
     
     def __init__(self, debug_mode=False): # Default debug False
         super().__init__()
         self.running = True
         self.debug_mode = debug_mode
-        self.sensitivity_x = 1500.0
-        self.sensitivity_y = 1500.0
-        self.keep_awake = False
-        self.request_wake = False
-        self.invert_scroll = False
         
-        # Perf Switch Logic
-        self.request_perf_switch = False
-        self.pending_perf_state = False 
+        # Shared settings (GUI thread writes, worker snapshots per frame)
+        self._settings = _Settings(1500.0, 1500.0, 0)
+        self._settings_size = ctypes.sizeof(_Settings)
+        # Reentrant: apply_settings holds it across the individual setters
+        self._settings_lock = threading.RLock()
+        self._click_thresh = -1.0
         
-        # Click Thresh Logic
-        self.pending_click_thresh = -1.0
-        self.current_click_thresh_val = 0.20
+        # Commands: cursor loop (wake, click threshold) and inference loop (perf mode)
+        self._cmd_queue = queue.SimpleQueue()
+        self._vision_cmd_queue = queue.SimpleQueue()
         
-        # Drawing Utils
-        self.mp_drawing = mp.solutions.drawing_utils
-        self.mp_hands_style = mp.solutions.hands
+        # Cursor loop -> inference loop: filtered hand speed, None = never skip inference
+        # (plain attribute: a stale read only delays one frame)
+        self._stride_edx = None
         
+    def _set_flag(self, bit, enabled):
+        with self._settings_lock:
+            if enabled:
+                self._settings.flags |= bit
+            else:
+                self._settings.flags &= ~bit
+
+    def _snapshot_settings(self, local):
+        with self._settings_lock:
+            ctypes.memmove(ctypes.addressof(local), ctypes.addressof(self._settings), self._settings_size)
+
     def set_performance_mode(self, enabled):
-        if self.pending_perf_state != enabled: # Only if changed
-            self.pending_perf_state = enabled
-            self.request_perf_switch = True
-            print(f"Performance Switch Requested: {enabled}")
+        with self._settings_lock:
+            if bool(self._settings.flags & SETTING_HIGH_PERF) != enabled: # Only if changed
+                self._set_flag(SETTING_HIGH_PERF, enabled)
+                self._vision_cmd_queue.put((CMD_PERF, enabled))
+                logger.info("Performance Switch Requested: %s", enabled)
     
     def set_click_threshold(self, val):
-        self.pending_click_thresh = val
-        self.current_click_thresh_val = val
+        with self._settings_lock:
+            # Every settings update carries the threshold; this check only keeps
+            # unchanged values from queueing redundant commands
+            if val != self._click_thresh:
+                self._click_thresh = val
+                self._cmd_queue.put((CMD_CLICK_THRESH, val))
 
     def set_sensitivity(self, x, y):
-        self.sensitivity_x = x
-        self.sensitivity_y = y
+        with self._settings_lock:
+            self._settings.sx = x
+            self._settings.sy = y
         
     def set_keep_awake(self, enabled):
-        self.keep_awake = enabled
+        self._set_flag(SETTING_KEEP_AWAKE, enabled)
         
     def trigger_wake(self):
-        self.request_wake = True
+        self._cmd_queue.put((CMD_WAKE, None))
         
     def set_invert_scroll(self, enabled):
-        self.invert_scroll = enabled
+        self._set_flag(SETTING_INVERT_SCROLL, enabled)
     
     def set_debug(self, enabled):
         self.debug_mode = enabled
 
+    def apply_settings(self, d):
+        """
+        Applies a settings_updated dict in one go.
+        """
+        with self._settings_lock:
+            self.set_sensitivity(d['sx'], d['sy'])
+            self.set_click_threshold(d['ct'])
+            self.set_keep_awake(d['ka'])
+            self.set_performance_mode(d['hp'])
+            self.set_invert_scroll(d['inv'])
+
+    def _drain_commands(self, gesture_mgr):
+        while not self._cmd_queue.empty():
+            cmd, value = self._cmd_queue.get_nowait()
+            if cmd == CMD_CLICK_THRESH:
+                gesture_mgr.set_click_threshold(value)
+            elif cmd == CMD_WAKE:
+                gesture_mgr.current_state = GestureState.IDLE
+                logger.debug("MANUAL WAKE UP!")
+
+    def _inference_loop(self, vision, packets):
+        """
+        Producer: camera + MediaPipe. Posts the newest
+        (frame, landmarks, lm_arr, handedness, timestamp) for the cursor loop.
+        A None packet means the camera is gone (not just slow).
+        """
+        try:
+            while self.running:
+                # Perf Switch Check (the engine is owned by this thread)
+                while not self._vision_cmd_queue.empty():
+                    _, enabled = self._vision_cmd_queue.get_nowait()
+                    logger.info("Switching Performance Mode...")
+                    vision.set_performance_mode(enabled)
+                
+                frame, landmarks, lm_arr, handedness = vision.get_frame(prev_edx=self._stride_edx)
+                if frame is None:
+                    # Only a dead camera ends the loop; a slow frame is retried
+                    if vision.camera_failed:
+                        break
+                    continue
+                # Monotonic clock, shared with the cursor loop's filter and extrapolation
+                put_latest(packets, (frame, landmarks, lm_arr, handedness, time.perf_counter()))
+        except Exception as e:
+            logger.exception("Inference Worker Crashed: %s", e)
+        put_latest(packets, None)
+
     def run(self):
-        print(f"Vision Worker Started (Debug={self.debug_mode})...")
+        logger.info("Vision Worker Started (Debug=%s)...", self.debug_mode)
         try:
-            vision = VisionEngine(high_performance=self.pending_perf_state)
+            vision = VisionEngine(high_performance=bool(self._settings.flags & SETTING_HIGH_PERF),
+                                  model_path=HAND_MODEL_PATH)
             input_ctrl = InputController()
             gesture_mgr = GestureManager()
             
             screen_w = input_ctrl.screen_width
             screen_h = input_ctrl.screen_height
             
-            prev_x, prev_y = 0, 0
+            prev_x, prev_y = 0.0, 0.0
             first_frame = True
             
-            smoother = OneEuroFilter(min_cutoff=0.1, beta=0.5) 
+            # Smoothing (OneEuro state for the fused cursor kernel)
+            min_cutoff, beta, d_cutoff = 0.1, 0.5, 1.0
+            smooth_state = new_one_euro_state()
             
-            print("System Ready.")
+            # Pre-warm: JIT compile before the first frame (instant with the AOT build)
+            cursor_step(new_one_euro_state(), 0.5, 0.5, 0.5, 0.5, time.perf_counter(), min_cutoff, beta, d_cutoff, False, True)
             
-            window_open = False
+            # Last real index-tip sample (x, y, t) + per-axis velocity for extrapolation
+            last_raw = None
+            vel_x, vel_y = 0.0, 0.0
+            extrapolate = False
+            
+            # Inference runs on its own thread, this loop only does gestures + cursor
+            packets = queue.Queue(maxsize=1)
+            producer = threading.Thread(target=self._inference_loop, args=(vision, packets), name="InferenceWorker", daemon=True)
+            producer.start()
+            
+            settings = _Settings()
+            
+            logger.info("System Ready.")
 
             while self.running:
-                # Perf Switch Check
-                if self.request_perf_switch:
-                    print("Switching Performance Mode...")
-                    vision.set_performance_mode(self.pending_perf_state)
-                    self.request_perf_switch = False
+                debug = self.debug_mode
+                
+                # One consistent settings snapshot per frame
+                self._snapshot_settings(settings)
+                flags = settings.flags
+                sensitivity = settings.sx
+                keep_awake = flags & SETTING_KEEP_AWAKE
+                invert_scroll = bool(flags & SETTING_INVERT_SCROLL)
                 
-                # Click Threshold Check
-                if self.pending_click_thresh > 0:
-                     gesture_mgr.set_click_threshold(self.pending_click_thresh)
-                     self.pending_click_thresh = -1.0
-                     
-                # Force Wake Check
-                if self.request_wake:
-                    gesture_mgr.current_state = GestureState.IDLE
-                    print("MANUAL WAKE UP!")
-                    self.request_wake = False
+                # Click threshold / manual wake: only when something was pushed
+                if not self._cmd_queue.empty():
+                    self._drain_commands(gesture_mgr)
                 
                 # Update
-                frame, landmarks, handedness = vision.get_frame()
-                if frame is None:
+                try:
+                    packet = packets.get(timeout=CURSOR_PERIOD)
+                except queue.Empty:
+                    # No new inference yet: keep the cursor moving along the predicted path
+                    if extrapolate:
+                        now = time.perf_counter()
+                        ahead = now - last_raw[2]
+                        if ahead <= MAX_EXTRAPOLATION:
+                            curr_x_norm, curr_y_norm, dx, dy, _ = cursor_step(
+                                smooth_state, last_raw[0] + vel_x * ahead, last_raw[1] + vel_y * ahead,
+                                prev_x, prev_y, now, min_cutoff, beta, d_cutoff, invert_scroll, False)
+                            input_ctrl.move_cursor_relative(dx, dy, sensitivity=sensitivity)
+                            prev_x, prev_y = curr_x_norm, curr_y_norm
+                            self.update_overlay_signal.emit(int(curr_x_norm * screen_w), int(curr_y_norm * screen_h), OVERLAY_TRACKING)
+                    continue
+                    
+                if packet is None:
                     break
+                frame, landmarks, lm_arr, handedness, frame_time = packet
 
                 state = GestureState.SLEEP
                 action = GestureAction.NONE
                 
                 ui_x, ui_y = 0, 0
+                cursor_norm = None
                 is_tracking = False
                 is_scrolling = False
 
                 if landmarks:
-                    state, action = gesture_mgr.process(landmarks, handedness)
+                    state, action = gesture_mgr.process(lm_arr, handedness)
                     
                     if action == GestureAction.WAKE:
-                        print("WAKE UP!")
+                        logger.debug("WAKE UP!")
                     elif action == GestureAction.SLEEP:
-                        if self.keep_awake:
+                        if keep_awake:
                             # print("SLEEP BLOCKED")
                             gesture_mgr.current_state = GestureState.IDLE
                             state = GestureState.IDLE
                         else:
-                            print("GOING TO SLEEP...")
+                            logger.debug("GOING TO SLEEP...")
                             
-                    if self.keep_awake and state == GestureState.SLEEP:
+                    if keep_awake and state == GestureState.SLEEP:
                          gesture_mgr.current_state = GestureState.IDLE
                          state = GestureState.IDLE
                     
                     # Calculate Cursor Source (Index Tip)
-                    i_tip = landmarks.landmark[8]
-                    raw_x, raw_y = i_tip.x, i_tip.y
+                    raw_x, raw_y = float(lm_arr[8, 0]), float(lm_arr[8, 1])
                     
-                    curr_x_norm, curr_y_norm = smoother.filter(raw_x, raw_y)
+                    # Velocity between real samples (drives extrapolation)
+                    vel_x, vel_y = 0.0, 0.0
+                    if last_raw is not None and not first_frame:
+                        sample_dt = frame_time - last_raw[2]
+                        if sample_dt > 0:
+                            vel_x = (raw_x - last_raw[0]) / sample_dt
+                            vel_y = (raw_y - last_raw[1]) / sample_dt
+                    last_raw = (raw_x, raw_y, frame_time)
+                    
+                    curr_x_norm, curr_y_norm, dx, dy, scroll = cursor_step(
+                        smooth_state, raw_x, raw_y, prev_x, prev_y, time.perf_counter(),
+                        min_cutoff, beta, d_cutoff, invert_scroll, first_frame)
+                    first_frame = False
                     
                     ui_x = int(curr_x_norm * screen_w)
                     ui_y = int(curr_y_norm * screen_h)
-                    
-                    if first_frame:
-                        prev_x, prev_y = curr_x_norm, curr_y_norm
-                        first_frame = False
 
                     # MOVE
                     if state == GestureState.TRACKING or state == GestureState.CLICK_PENDING:
                         is_tracking = True
-                        dx = curr_x_norm - prev_x
-                        dy = curr_y_norm - prev_y
-                        input_ctrl.move_cursor_relative(dx, dy, sensitivity=self.sensitivity_x)
+                        input_ctrl.move_cursor_relative(dx, dy, sensitivity=sensitivity)
                     
                     # SCROLL
                     elif state == GestureState.SCROLLING:
                         is_scrolling = True
-                        dy = curr_y_norm - prev_y
-                        if abs(dy) > 0.002: # Deadzone
-                            dir = -1.0 if dy > 0 else 1.0 
-                            magnitude = abs(dy) * 50.0 
-                            
-                            if self.invert_scroll:
-                                dir = -dir
-                                
-                            input_ctrl.scroll_vertical(dir * magnitude)
+                        if scroll != 0.0: # Outside deadzone
+                            input_ctrl.scroll_vertical(scroll)
 
                     # CLICK
                     if action == GestureAction.CLICK:
                         input_ctrl.left_click()
-                        print("CLICK!")
+                        logger.debug("CLICK!")
 
                     prev_x, prev_y = curr_x_norm, curr_y_norm
+                    cursor_norm = (curr_x_norm, curr_y_norm)
+                    extrapolate = is_tracking
                     
-                    # Debug Draw (Silhouette Mode)
-                    if self.debug_mode:
-                        h, w, c = frame.shape
-                        debug_frame = np.zeros((h, w, c), dtype=np.uint8)
-                        
-                        self.mp_drawing.draw_landmarks(
-                            debug_frame, 
-                            landmarks, 
-                            self.mp_hands_style.HAND_CONNECTIONS,
-                            self.mp_drawing.DrawingSpec(color=(0, 255, 0), thickness=2, circle_radius=2),
-                            self.mp_drawing.DrawingSpec(color=(0, 255, 0), thickness=2, circle_radius=2)
-                        )
-                        
-                        cx, cy = int(curr_x_norm * w), int(curr_y_norm * h)
-                        status_color = (100, 100, 100)
-                        if state == GestureState.IDLE: status_color = (255, 255, 255)
-                        if state == GestureState.TRACKING: status_color = (0, 255, 0)
-                        if state == GestureState.SCROLLING: status_color = (255, 255, 0)
-                        if state == GestureState.CLICK_PENDING: status_color = (0, 0, 255)
-                        if state == GestureState.SLEEP: status_color = (50, 50, 150)
-
-                        cv2.circle(debug_frame, (cx, cy), 8, status_color, -1)
-                        cv2.putText(debug_frame, f"State: {state}", (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.7, status_color, 2)
-                        if handedness:
-                            cv2.putText(debug_frame, f"Hand: {handedness}", (10, 60), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (200, 200, 200), 1)
-                             
-                        cv2.imshow("Ghost Hand Debug (Silhouette)", debug_frame)
-                        window_open = True
+                    # Frame skipping only while no click can be in flight (the thumb
+                    # flicks while the index tip, which drives edx, stays still)
+                    if state == GestureState.TRACKING or state == GestureState.CLICK_PENDING:
+                        self._stride_edx = None
+                    else:
+                        self._stride_edx = float(smooth_state[2]) # Filtered |d/dt| (see smoothing.py)
                 else:
-                    if self.debug_mode:
-                        h, w, c = frame.shape
-                        debug_frame = np.zeros((h, w, c), dtype=np.uint8)
-                        cv2.putText(debug_frame, "No Hand Detected", (30, h//2), cv2.FONT_HERSHEY_SIMPLEX, 1, (100, 100, 100), 2)
-                        cv2.imshow("Ghost Hand Debug (Silhouette)", debug_frame)
-                        window_open = True
-                        
                     first_frame = True
+                    extrapolate = False
+                    self._stride_edx = None
 
                 # Signal
-                is_sleep = (state == GestureState.SLEEP)
                 if landmarks:
-                    self.update_overlay_signal.emit(ui_x, ui_y, is_tracking, is_sleep, is_scrolling)
+                    overlay_flags = (is_tracking * OVERLAY_TRACKING) | ((state == GestureState.SLEEP) * OVERLAY_SLEEP) | (is_scrolling * OVERLAY_SCROLLING)
+                    self.update_overlay_signal.emit(ui_x, ui_y, overlay_flags)
                 
-                # Check Input
-                if self.debug_mode:
-                    key = cv2.waitKey(1) & 0xFF
-                    if key == ord('q'):
-                        self.running = False
-                else:
-                    if window_open:
-                        cv2.destroyAllWindows()
-                        cv2.waitKey(1)
-                        window_open = False
+                # Debug View (Silhouette Mode): drawn by DebugWindow on the GUI thread
+                if debug:
+                    h, w = frame.shape[:2]
+                    self.debug_frame_signal.emit((w, h, lm_arr, state, handedness, cursor_norm))
                         
+            self.running = False
+            producer.join(timeout=3.0)
             vision.release()
-            cv2.destroyAllWindows()
             self.finished_signal.emit()
             
         except Exception as e:
-            print(f"Vision Worker Crashed: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Vision Worker Crashed: %s", e)
             
     def stop(self):
         self.running = False
@@ -571,8 +812,13 @@ class GhostHandApp(QObject):
         self.kernel32 = ctypes.WinDLL('kernel32', use_last_error=True)
         self.mutex_handle = self.kernel32.CreateMutexW(None, False, "GhostHandMutex")
         if ctypes.get_last_error() == 183: # ERROR_ALREADY_EXISTS
-            print("GhostHand is already running! Exiting.")
+            logger.warning("GhostHand is already running! Exiting.")
             sys.exit(0)
+            
+        # Thread budget (see CPU_THREAD_BUDGET) + a slight priority boost for the UI thread
+        cv2.setNumThreads(CPU_THREAD_BUDGET)
+        THREAD_PRIORITY_ABOVE_NORMAL = 1
+        self.kernel32.SetThreadPriority(self.kernel32.GetCurrentThread(), THREAD_PRIORITY_ABOVE_NORMAL)
 
         self.app = QApplication(sys.argv)
         self.app.setQuitOnLastWindowClosed(False)
@@ -580,7 +826,7 @@ class GhostHandApp(QObject):
         # Load Config (Root Object)
         self.config = load_config()
         save_config(self.config) 
-        print(f"Loaded Profile: {self.config['current_profile']}")
+        logger.info("Loaded Profile: %s", self.config['current_profile'])
         
         # Init Settings from Current Profile
         curr_p_name = self.config["current_profile"]
@@ -590,8 +836,12 @@ class GhostHandApp(QObject):
             
         profile = self.config["profiles"][curr_p_name]
         
+        # Load each PNG once; the tray icon and the overlay share the hand pixmap
+        hand_pixmap = QPixmap(resource_path("ghost_hand.png"))
+        scroll_pixmap = QPixmap(resource_path("scroll_icon.png"))
+        
         # Load Icon
-        self.icon = QIcon(resource_path("ghost_hand.png"))
+        self.icon = QIcon(hand_pixmap)
         if self.icon.isNull():
              self.icon = self.app.style().standardIcon(QStyle.StandardPixmap.SP_ComputerIcon)
              
@@ -600,30 +850,40 @@ class GhostHandApp(QObject):
         
         # Overlay
         self.overlay = OverlayWindow(
-            hand_icon_path=resource_path("ghost_hand.png"),
-            scroll_icon_path=resource_path("scroll_icon.png")
-        )
-        self.overlay.show()
+            hand_pixmap=hand_pixmap,
+            scroll_pixmap=scroll_pixmap
+        ) # Shows itself on the first hand pose
         
         # Worker - Init with Config
         self.worker = VisionWorker(debug_mode=False)
-        self.worker.sensitivity_x = float(profile.get("sensitivity_x", 1500))
-        self.worker.sensitivity_y = float(profile.get("sensitivity_y", 1500))
-        self.worker.keep_awake = profile.get("keep_awake", False)
-        self.worker.pending_perf_state = profile.get("high_performance", False)
-        self.worker.current_click_thresh_val = float(profile.get("click_threshold", 0.20))
-        self.worker.pending_click_thresh = float(profile.get("click_threshold", 0.20))
-        self.worker.invert_scroll = profile.get("invert_scroll", False)
-        
-        self.worker.request_perf_switch = True
+        self.worker.apply_settings({
+            'sx': float(profile["sensitivity_x"]),
+            'sy': float(profile["sensitivity_y"]),
+            'ct': float(profile["click_threshold"]),
+            'ka': profile["keep_awake"],
+            'hp': profile["high_performance"],
+            'inv': profile["invert_scroll"],
+        })
         
         # Connect Signal
         self.worker.update_overlay_signal.connect(self.overlay.update_hand_pose)
         self.worker.finished_signal.connect(self.app.quit)
         
+        # Debug View
+        self.debug_window = DebugWindow()
+        self.debug_window.closed.connect(self.on_debug_closed)
+        self.debug_window.quit_requested.connect(self.exit_app)
+        self.worker.debug_frame_signal.connect(self.debug_window.show_debug)
+        
         # Settings Dialog
         self.settings_dlg = None
         
+        # Debounced config save (slider drags emit config_changed on every tick)
+        self.save_timer = QTimer()
+        self.save_timer.setSingleShot(True)
+        self.save_timer.setInterval(300)
+        self.save_timer.timeout.connect(self.flush_config)
+        
         # Tray Icon
         self.tray = QSystemTrayIcon(self.icon, self.app)
         self.tray.setToolTip(f"Ghost Hand [{curr_p_name}]")
@@ -661,12 +921,8 @@ class GhostHandApp(QObject):
             self.settings_dlg = SettingsDialog(self.config)
             
             # Connect to Worker
-            self.settings_dlg.sensitivity_changed.connect(self.worker.set_sensitivity)
-            self.settings_dlg.keep_awake_toggled.connect(self.worker.set_keep_awake)
-            self.settings_dlg.high_perf_toggled.connect(self.worker.set_performance_mode)
-            self.settings_dlg.click_threshold_changed.connect(self.worker.set_click_threshold)
+            self.settings_dlg.settings_updated.connect(self.worker.apply_settings)
             self.settings_dlg.wake_requested.connect(self.worker.trigger_wake)
-            self.settings_dlg.invert_scroll_toggled.connect(self.worker.set_invert_scroll)
             
             # Connect to Config Saver
             self.settings_dlg.config_changed.connect(self.save_current_config)
@@ -676,21 +932,40 @@ class GhostHandApp(QObject):
         self.settings_dlg.activateWindow()
         
     def save_current_config(self):
-        save_config(self.config)
+        # Restart the debounce; the write happens once the user stops changing things
+        self.save_timer.start()
         # Update Tray Tooltip
         p_name = self.config["current_profile"]
         self.tray.setToolTip(f"Ghost Hand [{p_name}]")
 
+    def flush_config(self):
+        self.save_timer.stop()
+        save_config(self.config)
+
     def toggle_debug(self, checked):
         self.worker.set_debug(checked)
+        if checked:
+            self.debug_window.show()
+            self.debug_window.raise_()
+        else:
+            self.debug_window.hide()
+            
+    def on_debug_closed(self):
+        # Window closed by the user: keep the tray toggle in sync
+        self.action_debug.setChecked(False)
+        self.worker.set_debug(False)
         
     def exit_app(self):
         self.worker.stop()
         self.app.quit()
         
     def cleanup(self):
+        # Don't lose a save that is still waiting on the debounce
+        if self.save_timer.isActive():
+            self.flush_config()
         self.worker.stop()
         self.worker.wait()
+        self.debug_window.close()
         self.overlay.close()
 
 if __name__ == "__main__":
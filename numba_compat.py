@@ -0,0 +1,31 @@
+"""
+Optional Numba support.
+If Numba is not installed, njit becomes a no-op decorator and the
+kernels run as plain Python (same results, just slower).
+"""
+import sys
+
+try:
+    from numba import njit as _numba_njit
+    HAS_NUMBA = True
+except ImportError:
+    _numba_njit = None
+    HAS_NUMBA = False
+
+# PyInstaller builds don't ship .py sources, which Numba's on-disk cache needs
+_CAN_CACHE = not getattr(sys, 'frozen', False)
+
+def njit(*args, **kwargs):
+    # Bare usage: @njit
+    if len(args) == 1 and callable(args[0]) and not kwargs:
+        return _numba_njit(args[0]) if HAS_NUMBA else args[0]
+
+    # Configured usage: @njit(signature, fastmath=True, cache=True)
+    if not HAS_NUMBA:
+        def decorator(func):
+            return func
+        return decorator
+
+    if not _CAN_CACHE:
+        kwargs.pop("cache", None)
+    return _numba_njit(*args, **kwargs)
@@ -1,9 +1,25 @@
 from PyQt6.QtWidgets import QMainWindow, QApplication, QWidget
-from PyQt6.QtCore import Qt, QTimer, pyqtSignal, QPointF
+from PyQt6.QtCore import Qt, QTimer, pyqtSignal, QPointF, QPoint
 from PyQt6.QtGui import QPainter, QColor, QPen, QBrush, QPixmap
 
+# update_hand_pose flags (packed into one int so the cross-thread signal stays primitive)
+OVERLAY_TRACKING = 1 << 0
+OVERLAY_SLEEP = 1 << 1
+OVERLAY_SCROLLING = 1 << 2
+
+ICON_SIZE = 64 # Logical px
+
+def _scaled_icon(pixmap, dpr):
+    """
+    Scales to ICON_SIZE at the screen's device pixel ratio, so paintEvent is a
+    straight blit instead of a resample on HiDPI screens.
+    """
+    px = pixmap.scaled(int(ICON_SIZE * dpr), int(ICON_SIZE * dpr), Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
+    px.setDevicePixelRatio(dpr)
+    return px
+
 class OverlayWindow(QWidget):
-    def __init__(self, hand_icon_path="ghost_hand.png", scroll_icon_path="scroll_icon.png"):
+    def __init__(self, hand_pixmap=None, scroll_pixmap=None):
         super().__init__()
         # Window Flags for Transparency and Click-through
         self.setWindowFlags(
@@ -15,74 +31,88 @@ class OverlayWindow(QWidget):
         self.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground)
         self.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents)
         
-        # Fullscreen
-        screen = QApplication.primaryScreen()
-        rect = screen.availableGeometry()
-        self.setGeometry(0, 0, rect.width(), rect.height())
-        
         self.hand_pos = None # (x, y)
         self.is_tracking = False
         self.is_sleep = False
         self.is_scrolling = False
         
-        # Load Assets
-        self.hand_pixmap = QPixmap(hand_icon_path)
+        # Load Assets (callers pass preloaded pixmaps, default files otherwise)
+        self.hand_pixmap = hand_pixmap if hand_pixmap is not None else QPixmap("ghost_hand.png")
         if self.hand_pixmap.isNull():
              self.hand_pixmap = QPixmap(32, 32)
              self.hand_pixmap.fill(Qt.GlobalColor.red)
              
-        self.scroll_pixmap = QPixmap(scroll_icon_path)
+        self.scroll_pixmap = scroll_pixmap if scroll_pixmap is not None else QPixmap("scroll_icon.png")
         if self.scroll_pixmap.isNull():
              self.scroll_pixmap = QPixmap(32, 32)
              self.scroll_pixmap.fill(Qt.GlobalColor.cyan)
              
-        # Scale if needed? For now assume assets are sized ok (e.g. 64x64)
-        # Or scale them here
-        if not self.hand_pixmap.isNull():
-            self.hand_pixmap = self.hand_pixmap.scaled(64, 64, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
-        if not self.scroll_pixmap.isNull():
-             self.scroll_pixmap = self.scroll_pixmap.scaled(64, 64, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
+        # Scale once, at device resolution (the caller's pixmaps are not modified)
+        dpr = self.devicePixelRatioF()
+        self.hand_pixmap = _scaled_icon(self.hand_pixmap, dpr)
+        self.scroll_pixmap = _scaled_icon(self.scroll_pixmap, dpr)
+        
+        # Widget geometry is in logical px
+        hand_size = self.hand_pixmap.deviceIndependentSize().toSize()
+        scroll_size = self.scroll_pixmap.deviceIndependentSize().toSize()
+        
+        # Icon-sized window that follows the hand (instead of a fullscreen
+        # translucent overlay the compositor has to blend every frame)
+        win_w = max(hand_size.width(), scroll_size.width())
+        win_h = max(hand_size.height(), scroll_size.height())
+        self.setFixedSize(win_w, win_h)
+        self._half = (win_w // 2, win_h // 2)
+        
+        # Pixmap offsets inside the window (icon centered), computed once per pixmap
+        self._hand_offset = QPoint((win_w - hand_size.width()) // 2, (win_h - hand_size.height()) // 2)
+        self._scroll_offset = QPoint((win_w - scroll_size.width()) // 2, (win_h - scroll_size.height()) // 2)
+        
+        # Paint state, precomputed in update_hand_pose
+        self._active_pixmap = self.hand_pixmap
+        self._draw_point = self._hand_offset
+        self._opacity = 0.4
+        self.setWindowOpacity(self._opacity)
 
-    def update_hand_pose(self, x, y, is_tracking, is_sleep=False, is_scrolling=False):
+    def update_hand_pose(self, x, y, flags=0):
         """
         Updates the visual hand position.
+        flags: OVERLAY_TRACKING | OVERLAY_SLEEP | OVERLAY_SCROLLING
         """
         self.hand_pos = (x, y)
-        self.is_tracking = is_tracking
-        self.is_sleep = is_sleep
-        self.is_scrolling = is_scrolling
-        self.update() # Trigger paintEvent
-
-    def paintEvent(self, event):
-        if not self.hand_pos:
-            return
-            
+        self.is_tracking = bool(flags & OVERLAY_TRACKING)
+        self.is_sleep = bool(flags & OVERLAY_SLEEP)
+        self.is_scrolling = bool(flags & OVERLAY_SCROLLING)
+        
+        # Draw nothing when sleeping
         if self.is_sleep:
-            return # Draw nothing when sleeping
-            
-        painter = QPainter(self)
-        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
-        painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform)
-
-        # Determine Target Pixmap
-        target_pixmap = self.hand_pixmap
-        if self.is_scrolling:
-            target_pixmap = self.scroll_pixmap
-            
-        if target_pixmap.isNull():
-             return
-
-        scaled_width = target_pixmap.width()
-        scaled_height = target_pixmap.height()
+            if self.isVisible():
+                self.hide()
+            return
         
-        draw_x = self.hand_pos[0] - scaled_width / 2
-        draw_y = self.hand_pos[1] - scaled_height / 2
+        # Moving the window needs no repaint, the compositor just moves it
+        self.move(x - self._half[0], y - self._half[1])
         
-        # Opacity
+        # Determine Target Pixmap (repaint only when it changes)
+        target_pixmap = self.scroll_pixmap if self.is_scrolling else self.hand_pixmap
+        if target_pixmap is not self._active_pixmap:
+            self._active_pixmap = target_pixmap
+            self._draw_point = self._scroll_offset if self.is_scrolling else self._hand_offset
+            self.update()
+        
+        # Opacity: one window-level alpha instead of per-pixel painter opacity
         opacity = 0.8 if (self.is_tracking or self.is_scrolling) else 0.4
-        painter.setOpacity(opacity)
+        if opacity != self._opacity:
+            self._opacity = opacity
+            self.setWindowOpacity(opacity)
         
-        painter.drawPixmap(int(draw_x), int(draw_y), target_pixmap)
+        if not self.isVisible():
+            self.show()
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform)
+        painter.drawPixmap(self._draw_point, self._active_pixmap)
 
 if __name__ == "__main__":
     app = QApplication(sys.argv)
@@ -96,7 +126,7 @@ if __name__ == "__main__":
         global x
         x += 5
         if x > 1920: x = 0
-        window.update_hand_pose(x, 500, True)
+        window.update_hand_pose(x, 500, OVERLAY_TRACKING)
         
     timer.timeout.connect(anim)
     timer.start(16) # ~60 FPS
@@ -1,76 +1,128 @@
 import math
-import time
+import sys
+from time import perf_counter_ns
+
+import numpy as np
+
+from numba_compat import njit, HAS_NUMBA
+
+# Ahead-of-time build of the kernels below (python smoothing_aot.py): no JIT at startup.
+# Frozen builds only: from source a leftover build would silently shadow edits to the kernels.
+smoothing_cc = None
+if getattr(sys, 'frozen', False):
+    try:
+        import smoothing_cc
+    except ImportError:
+        pass
+
+# alpha = 1 / (1 + tau/dt) with tau = 1/(2*pi*cutoff)  <=>  alpha = dt / (dt + _INV_2PI/cutoff)
+_INV_2PI = 1.0 / (2.0 * math.pi)
+
+# one_euro_step state layout: [last_x, last_y, last_dx_filt, last_time, initialized]
+# initialized: 0 = empty, 1 = position seeded, 2 = derivative seeded
+# Kept float64: last_time is an absolute clock reading in seconds, which float32
+# quantizes far coarser than a frame (~128 s for time.time(), ~60 ms for a perf_counter after ~12 days up)
+STATE_SIZE = 5
+
+# dt floor (s): back-to-back samples would otherwise blow up the derivative
+MIN_DT = 1.0 / 240.0
+
+def new_one_euro_state():
+    # Without Numba the step runs as plain Python, where a list of floats is
+    # ~3x faster to index than an ndarray (no numpy scalar boxing per access)
+    if not HAS_NUMBA and smoothing_cc is None:
+        return [0.0] * STATE_SIZE
+    return np.zeros(STATE_SIZE, dtype=np.float64)
+
+@njit(cache=True, fastmath=True)
+def _one_euro_step(state, x, y, timestamp, min_cutoff, beta, d_cutoff):
+    """
+    Single OneEuroFilter step over both axes.
+    state: float64[STATE_SIZE] (list of floats without Numba), updated in place.
+    Returns filtered (x, y).
+    """
+    if state[4] == 0.0:
+        # Initialize: no filtering on first value
+        state[0] = x
+        state[1] = y
+        state[3] = timestamp
+        state[4] = 1.0
+        return x, y
+        
+    dt = timestamp - state[3]
+    state[3] = timestamp
+    
+    # Avoid div by zero (repeated / out of order timestamp)
+    if dt <= 0: return state[0], state[1]
+    dt = max(dt, MIN_DT)
+    
+    # Combined derivative magnitude proxy (|dx/dt| + |dy/dt|)
+    edx = (abs(x - state[0]) + abs(y - state[1])) / dt
+    
+    # Filter the derivative (seeded with the first value, like the position)
+    if state[4] == 1.0:
+        state[2] = edx
+        state[4] = 2.0
+    else:
+        alpha_d = dt / (dt + _INV_2PI / d_cutoff)
+        state[2] += alpha_d * (edx - state[2])
+    
+    # Calculate Cutoff / Alpha
+    cutoff = min_cutoff + beta * abs(state[2])
+    alpha = dt / (dt + _INV_2PI / cutoff)
+    
+    # EMA: last += alpha * (x - last)
+    state[0] += alpha * (x - state[0])
+    state[1] += alpha * (y - state[1])
+    return state[0], state[1]
+
+@njit(cache=True, fastmath=True)
+def _cursor_step(state, raw_x, raw_y, prev_x, prev_y, timestamp, min_cutoff, beta, d_cutoff, invert_scroll, first_frame):
+    """
+    Per-frame cursor math in one native call:
+    OneEuro smoothing + relative delta + scroll deadzone/magnitude.
+    Returns (curr_x, curr_y, dx, dy, scroll) in normalized units (scroll in wheel steps).
+    """
+    curr_x, curr_y = _one_euro_step(state, raw_x, raw_y, timestamp, min_cutoff, beta, d_cutoff)
+    
+    if first_frame:
+        prev_x, prev_y = curr_x, curr_y
+        
+    dx = curr_x - prev_x
+    dy = curr_y - prev_y
+    
+    # Scroll: Deadzone, then hand up = content up (unless inverted)
+    scroll = 0.0
+    if abs(dy) > 0.002:
+        direction = -1.0 if dy > 0 else 1.0
+        if invert_scroll:
+            direction = -direction
+        scroll = direction * abs(dy) * 50.0
+        
+    return curr_x, curr_y, dx, dy, scroll
+
+# Public entry points: the prebuilt module if present, else the JIT kernels.
+# (AOT functions can't be called from other @njit code; _one_euro_step is the one to compose.)
+if smoothing_cc is not None:
+    one_euro_step = smoothing_cc.one_euro_step
+    cursor_step = smoothing_cc.cursor_step
+else:
+    one_euro_step = _one_euro_step
+    cursor_step = _cursor_step
 
 class OneEuroFilter:
+    """
+    Object wrapper around one_euro_step (same state, same math).
+    """
     def __init__(self, min_cutoff=1.0, beta=0.0, d_cutoff=1.0, freq=30.0):
         self.freq = freq
         self.min_cutoff = min_cutoff
         self.beta = beta
         self.d_cutoff = d_cutoff
-        
-        self.x_filter = LowPassFilter()
-        self.y_filter = LowPassFilter()
-        self.dx_filter = LowPassFilter()
-        
-        self.last_time = None
+        self.state = new_one_euro_state()
         
     def filter(self, x, y, timestamp=None):
-        # timestamp in seconds
+        # timestamp in seconds (monotonic, ns resolution by default)
         if timestamp is None:
-            timestamp = time.time()
-            
-        if self.last_time is None:
-            self.last_time = timestamp
-            # Initialize
-            self.x_filter.set_alpha(1.0) # No filtering on first value
-            self.y_filter.set_alpha(1.0)
-            return self.x_filter.filter(x), self.y_filter.filter(y)
-            
-        dt = timestamp - self.last_time
-        self.last_time = timestamp
-        
-        # Avoid div by zero
-        if dt <= 0: return self.x_filter.last_val, self.y_filter.last_val
-        
-        # Calculate velocity (dx/dt)
-        dx_raw = (x - self.x_filter.last_val) / dt
-        dy_raw = (y - self.y_filter.last_val) / dt
-        
-        # Filter velocity (optional but good for jittery derivative) - simplified here just magnitude?
-        # Actually OneEuro uses the derivative of the signal to tune the alpha.
-        # We process X and Y independently but usually share Beta tuning?
-        # Let's keep it simple: use magnitude of change for adaptive cutoff.
-        
-        # Standard One Euro Filter Implementation:
-        # 1. Estimate derivative (using raw change)
-        target_dx = (x - self.x_filter.last_val) / dt
-        target_dy = (y - self.y_filter.last_val) / dt
-        
-        # Filter the derivative
-        edx = self.dx_filter.filter(abs(target_dx) + abs(target_dy)) # Combined magnitude proxy
-        
-        # Calculate Cutoff
-        cutoff = self.min_cutoff + self.beta * abs(edx)
-        
-        # Calculate Alpha
-        tau = 1.0 / (2 * math.pi * cutoff)
-        alpha = 1.0 / (1.0 + tau / dt)
-        
-        return self.x_filter.filter(x, alpha), self.y_filter.filter(y, alpha)
-
-class LowPassFilter:
-    def __init__(self):
-        self.last_val = None
-        
-    def set_alpha(self, alpha):
-        self.forced_alpha = alpha
-        
-    def filter(self, val, alpha=None):
-        if self.last_val is None:
-            self.last_val = val
-            return val
-            
-        if alpha is None: alpha = 1.0
-        
-        self.last_val = alpha * val + (1.0 - alpha) * self.last_val
-        return self.last_val
+            timestamp = perf_counter_ns() * 1e-9
+        return one_euro_step(self.state, x, y, timestamp, self.min_cutoff, self.beta, self.d_cutoff)
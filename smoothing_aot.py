@@ -0,0 +1,42 @@
+"""
+Ahead-of-time build of the Numba kernels (smoothing + gesture_engine).
+Run once before packaging (build_exe.bat does):
+
+    python smoothing_aot.py
+
+This writes the smoothing_cc and gesture_cc extensions next to the sources.
+Frozen builds import them, so they skip the Numba JIT at startup (they can't
+use Numba's on-disk cache, and gesture_engine's eager signatures would
+otherwise compile at import on every launch). Running from source always uses
+the @njit kernels, so a stale build can't hide kernel edits.
+
+numba.pycc is pending deprecation (NumbaPendingDeprecationWarning since
+Numba 0.57, still the case in 0.68) with no replacement yet. If it is removed,
+drop this step: the app falls back to the JIT kernels.
+"""
+import os
+
+from numba.pycc import CC
+
+import gesture_engine
+import smoothing
+
+_OUTPUT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+cc = CC('smoothing_cc')
+cc.output_dir = _OUTPUT_DIR
+
+# Explicit signatures: state is float64[STATE_SIZE], everything else float64 / bool
+cc.export('one_euro_step', 'UniTuple(f8, 2)(f8[:], f8, f8, f8, f8, f8, f8)')(smoothing._one_euro_step.py_func)
+cc.export('cursor_step', 'UniTuple(f8, 5)(f8[:], f8, f8, f8, f8, f8, f8, f8, f8, b1, b1)')(smoothing._cursor_step.py_func)
+
+# Same signatures as the @_kernel declarations in gesture_engine.py
+gesture_cc = CC('gesture_cc')
+gesture_cc.output_dir = _OUTPUT_DIR
+gesture_cc.export('compute_pose_mask', 'i4(f4[:, ::1], f4)')(gesture_engine._compute_pose_mask.py_func)
+gesture_cc.export('compute_click_distances', 'Tuple((f4, f4))(f4[:, ::1])')(gesture_engine._compute_click_distances.py_func)
+gesture_cc.export('click_kernel', 'Tuple((f4, f4, b1))(f4[:, ::1], f4)')(gesture_engine._click_kernel.py_func)
+
+if __name__ == "__main__":
+    cc.compile()
+    gesture_cc.compile()
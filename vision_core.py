@@ -1,55 +1,293 @@
 import cv2
 import mediapipe as mp
+import logging
+import numpy as np
+import os
+import queue
+import threading
 import time
 
+logger = logging.getLogger(__name__)
+
+# MediaPipe hand = 21 landmarks x (x, y, z)
+NUM_LANDMARKS = 21
+
+# How long get_frame waits for a frame before returning "no frame yet" (the caller retries)
+FRAME_TIMEOUT = 2.0
+
+# How long closing the camera waits for the reader thread to leave cap.read()
+READER_JOIN_TIMEOUT = 1.0
+
+# ROI tracking: once a hand is found, MediaPipe only sees a square crop around it
+ROI_SIZE = 256       # px, crop is resized to ROI_SIZE x ROI_SIZE
+ROI_SCALE = 2.0      # crop side = hand span * ROI_SCALE
+
+# Full-frame search input: MediaPipe resizes to ~256 internally, so shrink first
+INFER_SHORT_SIDE = 256
+
+# Frame skipping: while the hand is still, run inference on every FRAME_STRIDE-th frame
+FRAME_STRIDE = 2
+STILL_EDX = 0.05     # filtered |dx/dt| + |dy/dt| (normalized units/s) below which the hand counts as still
+
+# Optional Tasks API model bundle; without it the legacy Solutions graph is used
+HAND_MODEL_FILE = "hand_landmarker.task"
+
+# Backend override: "tasks" or "solutions" (unset = tasks if the model exists)
+BACKEND_ENV = "GHOSTHAND_BACKEND"
+
+def landmarks_to_array(landmarks, out=None):
+    """
+    Copies a NormalizedLandmarkList into a (21, 3) float32 array (SoA) so
+    downstream code reads contiguous memory instead of protobuf fields.
+    out: optional preallocated buffer to fill (avoids a per-frame allocation).
+    """
+    if out is None:
+        out = np.empty((NUM_LANDMARKS, 3), dtype=np.float32)
+    out[:] = [(p.x, p.y, p.z) for p in landmarks.landmark]
+    return out
+
+def _task_landmarks_to_array(landmarks):
+    """Same as landmarks_to_array for a Tasks API landmark list."""
+    out = np.empty((NUM_LANDMARKS, 3), dtype=np.float32)
+    out[:] = [(p.x, p.y, p.z) for p in landmarks]
+    return out
+
+def put_latest(q, item):
+    """
+    Puts item on a maxsize=1 queue, replacing whatever stale item is waiting
+    (drain-on-full). The consumer always gets the newest item.
+    """
+    try:
+        q.put_nowait(item)
+    except queue.Full:
+        try:
+            q.get_nowait()
+        except queue.Empty:
+            pass
+        try:
+            q.put_nowait(item)
+        except queue.Full:
+            pass
+
 class VisionEngine:
     """
     Handles camera acquisition and MediaPipe Hands inference.
     Supports dynamic High Performance vs Low Power modes.
+    model_path: optional HandLandmarker .task bundle. If it exists, inference runs
+        through the Tasks API in LIVE_STREAM mode instead of mp.solutions.hands.
     """
-    def __init__(self, high_performance=False):
+    def __init__(self, high_performance=False, model_path=None):
         self.mp_hands = mp.solutions.hands
         self.high_performance = high_performance
         self.cap = None
         self.hands = None
+        # Separate graph for ROI crops: Hands tracks its last hand rect in the
+        # coordinates of the image it saw, so crop and full frame must not share one
+        self.roi_hands = None
         self.camera_index = 0
         
+        # Tasks API backend: results arrive on MediaPipe's thread via _on_result
+        self.model_path = model_path
+        self.landmarker = None
+        self._result_lock = threading.Lock()
+        self._latest_result = (None, None, None) # (landmarks, lm_arr, handedness)
+        self._last_ts_ms = 0
+        
+        # Camera reader thread -> triple buffer (reader back / ready / get_frame front).
+        # Older frames are overwritten, and capture buffers are recycled instead of reallocated.
+        self._frame_lock = threading.Lock()
+        self._frame_ready = threading.Event() # Set when _ready_frame holds an unseen frame
+        self._ready_frame = None
+        self._front_frame = None
+        self._camera_failed = False
+        self._reader = None
+        # Per-reader events: stop, and "release the capture yourself" if the join timed out
+        self._reader_stop = None
+        self._reader_orphaned = None
+        self._stalled = False
+        
+        # Last hand ROI (x1, y1, side) in full-frame pixels, None = search full frame
+        self._last_bbox = None
+        
+        # RGB conversion targets, one per input shape (full frame, ROI crop)
+        self._rgb_bufs = {}
+        
+        # Full-frame inference size (w, h), from the first frame the camera delivers
+        self._infer_size = None
+        
+        # Frame skipping: last (landmarks, lm_arr, handedness) with a hand, frames since inference
+        self._cached_result = None
+        self._skip_ctr = 0
+        
         self._init_system()
 
+    def _mode_params(self):
+        """(model_complexity, width, height, fps) for the current mode."""
+        if self.high_performance:
+            logger.info("Vision: High Performance Mode (HD + Full Model)")
+            return 1, 1280, 720, 60
+        logger.info("Vision: Low Performance Mode (SD + Lite Model)")
+        return 0, 640, 480, None # Driver default FPS
+
     def _init_system(self):
         # Release existing if any
-        if self.hands: self.hands.close()
-        if self.cap: self.cap.release()
+        self._close_camera()
+        self._close_models()
+        self._rgb_bufs.clear() # Resolution may change
+        self._infer_size = None
         
         # Config based on mode
-        if self.high_performance:
-            print("Vision: High Performance Mode (HD + Full Model)")
-            model_comp = 1
-            w, h = 1280, 720
-        else:
-            print("Vision: Low Performance Mode (SD + Lite Model)")
-            model_comp = 0
-            w, h = 640, 480
-            
-        # Init Camera
+        model_comp, w, h, fps = self._mode_params()
+        self._open_camera(w, h, fps)
+        self._init_models(model_comp)
+
+    def _close_models(self):
+        if self.hands: self.hands.close()
+        if self.roi_hands: self.roi_hands.close()
+        if self.landmarker: self.landmarker.close()
+        self.hands = None
+        self.roi_hands = None
+        self.landmarker = None
+        # Tracking state belongs to the old graph
+        self._last_bbox = None
+        self._cached_result = None
+        self._skip_ctr = 0
+        with self._result_lock:
+            self._latest_result = (None, None, None)
+
+    def _open_camera(self, w, h, fps):
         try:
             self.cap = cv2.VideoCapture(self.camera_index)
+            # MJPG before the size: uncompressed YUY2 at 720p saturates USB and caps the frame rate
+            self.cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*'MJPG'))
             self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, w)
             self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, h)
+            if fps:
+                self.cap.set(cv2.CAP_PROP_FPS, fps)
+            # Don't let the driver queue up stale frames behind our back
+            self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
             
             if not self.cap.isOpened():
-                print(f"Error: Could not open camera {self.camera_index}")
+                logger.error("Could not open camera %s", self.camera_index)
+            else:
+                self._start_reader()
         except Exception as e:
-            print(f"Camera Error: {e}")
+            logger.error("Camera Error: %s", e)
+
+    def _init_models(self, model_comp):
+        backend = os.environ.get(BACKEND_ENV, "").strip().lower()
+        if backend not in ("", "tasks", "solutions"):
+            logger.warning("Unknown %s=%r, using the default backend", BACKEND_ENV, backend)
+            backend = ""
+        if backend == "tasks" and not (self.model_path and os.path.exists(self.model_path)):
+            logger.warning("%s=tasks but %s is missing", BACKEND_ENV, HAND_MODEL_FILE)
+        
+        if backend != "solutions" and self.model_path and os.path.exists(self.model_path):
+            try:
+                self.landmarker = self._create_landmarker()
+                logger.info("Vision: Tasks API HandLandmarker (LIVE_STREAM)")
+                return
+            except Exception as e:
+                logger.warning("HandLandmarker unavailable, using Solutions API: %s", e)
         
-        # Init MediaPipe
-        self.hands = self.mp_hands.Hands(
+        self.hands, self.roi_hands = [self.mp_hands.Hands(
             model_complexity=model_comp,
             min_detection_confidence=0.7,
             min_tracking_confidence=0.5,
             max_num_hands=1
-        )
+        ) for _ in range(2)]
+        
+    def _create_landmarker(self):
+        vision = mp.tasks.vision
+        # CPU delegate: the Python Tasks GPU delegate is not available on Windows
+        options = vision.HandLandmarkerOptions(
+            base_options=mp.tasks.BaseOptions(
+                model_asset_path=self.model_path,
+                delegate=mp.tasks.BaseOptions.Delegate.CPU),
+            running_mode=vision.RunningMode.LIVE_STREAM,
+            num_hands=1,
+            min_hand_detection_confidence=0.7,
+            min_tracking_confidence=0.5,
+            result_callback=self._on_result)
+        return vision.HandLandmarker.create_from_options(options)
+
+    def _on_result(self, result, output_image, timestamp_ms):
+        """LIVE_STREAM callback (MediaPipe thread): caches the newest result."""
+        landmarks = lm_arr = handedness = None
+        if result.hand_landmarks:
+            landmarks = result.hand_landmarks[0]
+            lm_arr = _task_landmarks_to_array(landmarks)
+            if result.handedness:
+                handedness = result.handedness[0][0].category_name
+        with self._result_lock:
+            self._latest_result = (landmarks, lm_arr, handedness)
+
+    def _start_reader(self):
+        self._reader_stop = threading.Event()
+        self._reader_orphaned = threading.Event()
+        self._reader = threading.Thread(target=self._reader_loop, args=(self.cap, self._reader_stop, self._reader_orphaned),
+                                        name="CameraReader", daemon=True)
+        self._reader.start()
+
+    def _stop_reader(self):
+        """
+        Stops the reader thread. Returns False if it is still stuck in cap.read();
+        it then releases the capture itself when the read returns.
+        """
+        joined = True
+        if self._reader:
+            self._reader_stop.set()
+            self._reader.join(timeout=READER_JOIN_TIMEOUT)
+            if self._reader.is_alive():
+                logger.warning("Camera reader did not stop in time, releasing the camera when it does")
+                self._reader_orphaned.set()
+                # It may have exited between the join and the flag
+                joined = not self._reader.is_alive()
+            self._reader = None
+            self._reader_stop = None
+            self._reader_orphaned = None
+        # Drop anything left over from the old capture
+        with self._frame_lock:
+            self._ready_frame = None
+            self._front_frame = None
+            self._camera_failed = False
+            self._frame_ready.clear()
+        self._stalled = False
+        return joined
+
+    def _close_camera(self):
+        # Never release under a reader that is still inside cap.read()
+        if self._stop_reader() and self.cap:
+            self.cap.release()
+        self.cap = None
+
+    def _reader_loop(self, cap, stop, orphaned):
+        """
+        Reads the camera as fast as it delivers and keeps only the newest frame,
+        so inference never works on a frame that has been sitting in a queue.
+        stop / orphaned belong to this reader only, so a reader that outlives its
+        session can't touch the next one.
+        """
+        back = None # Buffer to capture into (never the one get_frame is reading)
+        while not stop.is_set():
+            success, frame = cap.read(back) if back is not None else cap.read()
+            
+            with self._frame_lock:
+                if stop.is_set():
+                    break
+                if not success:
+                    # Signals a dead camera to get_frame
+                    self._camera_failed = True
+                    self._frame_ready.set()
+                    break
+                
+                # Publish: the new frame becomes ready, the stale one is recycled
+                back, self._ready_frame = self._ready_frame, frame
+                self._frame_ready.set()
         
+        if orphaned.is_set():
+            cap.release()
+
     def set_performance_mode(self, high_performance):
         """
         Switch between Lite (Low Spec) and Full (High Spec) models.
@@ -58,37 +296,164 @@ class VisionEngine:
             return
         
         self.high_performance = high_performance
+        model_comp, w, h, fps = self._mode_params()
+        
+        # Reopening a camera on Windows takes 0.5-1.5 s: keep it if it already
+        # delivers the new mode's resolution (e.g. a webcam without 720p)
+        cap = self.cap
+        if cap is not None and cap.isOpened() and self._reader is not None and \
+                (int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)), int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))) == (w, h):
+            logger.info("Vision: Camera resolution unchanged, only reloading the model")
+            if fps:
+                # VideoCapture isn't thread-safe: pause the reader around the property change
+                if not self._stop_reader():
+                    # Reader stuck in cap.read() (it releases the capture itself): reopen
+                    self.cap = None
+                    self._init_system()
+                    return
+                cap.set(cv2.CAP_PROP_FPS, fps)
+                self._start_reader()
+            self._close_models()
+            self._init_models(model_comp)
+            return
+        
         # Re-initialize
         self._init_system()
 
-    def get_frame(self):
+    def _to_rgb(self, image):
+        # Convert to RGB (into a preallocated buffer; inference copies or finishes with it before the next frame)
+        rgb_frame = self._rgb_bufs.get(image.shape)
+        if rgb_frame is None:
+            rgb_frame = self._rgb_bufs[image.shape] = np.empty(image.shape, dtype=np.uint8)
+        cv2.cvtColor(image, cv2.COLOR_BGR2RGB, dst=rgb_frame)
+        return rgb_frame
+
+    def _downscale(self, frame, w, h):
+        # Full-frame inference input (size fixed per capture)
+        if self._infer_size is None:
+            scale = min(INFER_SHORT_SIDE / min(w, h), 1.0) # Never upscale
+            self._infer_size = (max(int(w * scale), 1), max(int(h * scale), 1))
+        return cv2.resize(frame, self._infer_size, interpolation=cv2.INTER_AREA)
+
+    def _process(self, image, hands):
+        rgb_frame = self._to_rgb(image)
+        
+        # Solutions API: a read-only array is wrapped by reference, a writeable one is
+        # copied into the graph. Two flag writes are far cheaper than that copy.
+        # (The Tasks path builds an mp.Image instead and does not need this.)
+        rgb_frame.flags.writeable = False
+        results = hands.process(rgb_frame)
+        rgb_frame.flags.writeable = True
+        return results
+
+    def _detect_async(self, frame, w, h):
+        """
+        Submits the frame to the HandLandmarker and returns the newest finished result.
+        The task tracks the hand between frames itself, so no ROI crop here.
+        """
+        rgb_frame = self._to_rgb(self._downscale(frame, w, h))
+        
+        # LIVE_STREAM requires strictly increasing timestamps
+        ts_ms = max(int(time.monotonic() * 1000), self._last_ts_ms + 1)
+        self._last_ts_ms = ts_ms
+        # New mp.Image per frame on purpose: detect_async may still hold the previous one,
+        # so an Image aliasing the reused RGB buffer could be overwritten mid-inference
+        self.landmarker.detect_async(mp.Image(image_format=mp.ImageFormat.SRGB, data=rgb_frame), ts_ms)
+        
+        with self._result_lock:
+            return self._latest_result
+
+    def _roi_from_landmarks(self, lm_arr, w, h):
+        """
+        Square crop around the hand for the next frame, or None if it would
+        cover (almost) the whole frame anyway.
+        """
+        min_x, min_y = lm_arr[:, :2].min(axis=0)
+        max_x, max_y = lm_arr[:, :2].max(axis=0)
+        span = max((max_x - min_x) * w, (max_y - min_y) * h)
+        
+        # Never smaller than the model input (no upscaling)
+        side = int(max(span * ROI_SCALE, ROI_SIZE))
+        if side >= min(w, h):
+            return None
+        
+        cx = (max_x + min_x) * 0.5 * w
+        cy = (max_y + min_y) * 0.5 * h
+        x1 = min(max(int(cx - side / 2), 0), w - side)
+        y1 = min(max(int(cy - side / 2), 0), h - side)
+        return (x1, y1, side)
+
+    def get_frame(self, prev_edx=None):
         """
         Captures a frame, Processes it.
+        prev_edx: filtered hand speed from the cursor filter. Below STILL_EDX only every
+            FRAME_STRIDE-th frame is inferred; the others repeat the last landmarks.
+            None = infer every frame.
         Returns: 
             frame (image): Original frame (BGR).
-            landmarks (NormalizedLandmarkList): Detected hand landmarks (or None).
+            landmarks (NormalizedLandmarkList): Raw MediaPipe landmarks (or None).
+                Relative to the model input (the ROI crop while tracking): use lm_arr for positions.
+            lm_arr (ndarray): (21, 3) float32 landmarks in full-frame normalized coordinates (or None).
             handedness (str): "Left" or "Right" (or None).
+            frame is None either when no frame arrived within FRAME_TIMEOUT (retry) or when
+            the camera is gone; camera_failed tells them apart.
         """
         if not self.cap or not self.cap.isOpened():
-             return None, None, None
-             
-        success, frame = self.cap.read()
-        if not success:
-            return None, None, None
+             return None, None, None, None
+        
+        # Blocks until the reader thread has a fresh frame
+        if not self._frame_ready.wait(FRAME_TIMEOUT):
+            # Slow camera (reopen, mode switch, USB hiccup): not fatal, the caller retries
+            if not self._stalled:
+                self._stalled = True
+                logger.warning("No camera frame for %.1f s, still waiting", FRAME_TIMEOUT)
+            return None, None, None, None
+        with self._frame_lock:
+            if self._camera_failed:
+                return None, None, None, None
+            # Take the ready frame; our previous front goes back to the reader
+            self._front_frame, self._ready_frame = self._ready_frame, self._front_frame
+            self._frame_ready.clear()
+        self._stalled = False
+        frame = self._front_frame
 
         # FLIP FRAME HORIZONTALLY (Mirror View)
         frame = cv2.flip(frame, 1)
 
+        h, w = frame.shape[:2]
+
+        # Hand still: reuse the last result for this frame
+        if prev_edx is not None and prev_edx < STILL_EDX and self._cached_result is not None:
+            self._skip_ctr += 1
+            if self._skip_ctr < FRAME_STRIDE:
+                return (frame,) + self._cached_result
+        self._skip_ctr = 0
+
+        if self.landmarker:
+            result = self._detect_async(frame, w, h)
+            self._cached_result = result if result[0] is not None else None
+            return (frame,) + result
+
         # Process
-        # Convert to RGB
-        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        # Tracking: run on the ROI around last frame's hand
+        results = None
+        roi = self._last_bbox
+        if roi is not None:
+            x1, y1, side = roi
+            crop = cv2.resize(frame[y1:y1 + side, x1:x1 + side], (ROI_SIZE, ROI_SIZE), interpolation=cv2.INTER_AREA)
+            results = self._process(crop, self.roi_hands)
+            
+            if not results.multi_hand_landmarks:
+                # Lost it: search the full frame (same frame, no drop)
+                results = None
+                roi = None
         
-        # Pass by reference to writeable=False to improve performance
-        rgb_frame.flags.writeable = False
-        results = self.hands.process(rgb_frame)
-        rgb_frame.flags.writeable = True
+        if results is None:
+            # Landmarks are normalized, so the downscaled frame needs no remap
+            results = self._process(self._downscale(frame, w, h), self.hands)
 
         landmarks = None
+        lm_arr = None
         handedness = None
         
         if results.multi_hand_landmarks:
@@ -96,24 +461,46 @@ class VisionEngine:
             if results.multi_handedness:
                 handedness = results.multi_handedness[0].classification[0].label
             
-        return frame, landmarks, handedness
+            # One protobuf walk per frame; everything downstream reads the array
+            # (fresh per frame: it is handed to another thread)
+            lm_arr = landmarks_to_array(landmarks)
+            
+            # Map ROI-normalized landmarks back to full-frame coordinates
+            if roi is not None:
+                x1, y1, side = roi
+                lm_arr[:, 0] = (x1 + lm_arr[:, 0] * side) / w
+                lm_arr[:, 1] = (y1 + lm_arr[:, 1] * side) / h
+                lm_arr[:, 2] *= side / w
+            
+            self._last_bbox = self._roi_from_landmarks(lm_arr, w, h)
+            self._cached_result = (landmarks, lm_arr, handedness)
+        else:
+            self._last_bbox = None
+            self._cached_result = None
+            
+        return frame, landmarks, lm_arr, handedness
+
+    @property
+    def camera_failed(self):
+        """True once the camera can't deliver frames anymore (not opened, or a read failed)."""
+        return self._camera_failed or not self.cap or not self.cap.isOpened()
 
     def release(self):
-        if self.cap: self.cap.release()
-        if self.hands: self.hands.close()
+        self._close_camera()
+        self._close_models()
 
 if __name__ == "__main__":
     ve = VisionEngine(high_performance=False)
     print("Camera opened. Press 'q' to quit.")
     try:
         while True:
-            frame, landmarks, handedness = ve.get_frame()
+            frame, landmarks, lm_arr, handedness = ve.get_frame()
             if frame is None:
                 break
                 
             if landmarks:
                 h, w, _ = frame.shape
-                cx, cy = int(landmarks.landmark[8].x * w), int(landmarks.landmark[8].y * h)
+                cx, cy = int(lm_arr[8, 0] * w), int(lm_arr[8, 1] * h)
                 cv2.circle(frame, (cx, cy), 10, (255, 0, 0), -1)
                 if handedness:
                     cv2.putText(frame, handedness, (cx, cy-40), cv2.FONT_HERSHEY_SIMPLEX, 1, (255,0,0), 2)